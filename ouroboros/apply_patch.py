@@ -18,18 +18,33 @@ def _norm_line(l: str) -> str:
         return l[1:]
     return l
 
-def _find_subseq(hay, needle):
-    if not needle:
-        return 0
+def _find_subseq(hay, needle, hay_h=None):
+    # Boyer-Moore-Horspool over per-line hashes: integer compares, and a
+    # mismatch skips up to len(needle) lines. Strings are compared only once
+    # every hash in the window matches (guards against collisions).
+    # hay_h, if given, must be [hash(x) for x in hay].
     n = len(needle)
-    for i in range(0, len(hay) - n + 1):
-        ok = True
-        for j in range(n):
-            if hay[i + j] != needle[j]:
-                ok = False
-                break
-        if ok:
-            return i
+    if not n:
+        return 0
+    h = len(hay)
+    if n > h:
+        return -1
+    if hay_h is None:
+        hay_h = [hash(x) for x in hay]
+    needle_h = [hash(x) for x in needle]
+    last = n - 1
+    shift = {}
+    for j in range(last):
+        shift[needle_h[j]] = last - j
+    i = last
+    while i < h:
+        j, k = last, i
+        while j >= 0 and hay_h[k] == needle_h[j]:
+            j -= 1
+            k -= 1
+        if j < 0 and hay[i - last:i + 1] == needle:
+            return i - last
+        i += shift.get(hay_h[i], n)
     return -1
 
 def _find_subseq_rstrip(hay, needle):
@@ -47,6 +62,8 @@ def apply_update_file(path: str, hunks: list[list[str]]):
 
     text = p.read_text(encoding="utf-8")
     src = text.splitlines()
+    # Line hashes are computed once per file and kept in step with src
+    src_h = [hash(x) for x in src]
 
     for hunk in hunks:
         old_seq = []
@@ -61,7 +78,7 @@ def apply_update_file(path: str, hunks: list[list[str]]):
                 old_seq.append(c)
                 new_seq.append(c)
 
-        idx = _find_subseq(src, old_seq)
+        idx = _find_subseq(src, old_seq, src_h)
         if idx < 0:
             idx = _find_subseq_rstrip(src, old_seq)
         if idx < 0:
@@ -69,7 +86,9 @@ def apply_update_file(path: str, hunks: list[list[str]]):
             sys.stderr.write("HUNK (old_seq):\n" + "\n".join(old_seq) + "\n")
             sys.exit(3)
 
-        src = src[:idx] + new_seq + src[idx + len(old_seq):]
+        # In-place splice: one memmove instead of building three new lists
+        src[idx:idx + len(old_seq)] = new_seq
+        src_h[idx:idx + len(old_seq)] = [hash(x) for x in new_seq]
 
     p.write_text("\n".join(src) + "\n", encoding="utf-8")
 
@@ -172,7 +191,15 @@ if __name__ == "__main__":
 
 
 def install():
-    """Install apply_patch script to /usr/local/bin/."""
+    """Install apply_patch script to /usr/local/bin/ (no-op if already current)."""
+    data = APPLY_PATCH_CODE.encode("utf-8")
+    try:
+        if APPLY_PATCH_PATH.read_bytes() == data:
+            if APPLY_PATCH_PATH.stat().st_mode & 0o777 != 0o755:
+                APPLY_PATCH_PATH.chmod(0o755)
+            return
+    except OSError:
+        pass
     APPLY_PATCH_PATH.parent.mkdir(parents=True, exist_ok=True)
-    APPLY_PATCH_PATH.write_text(APPLY_PATCH_CODE, encoding="utf-8")
+    APPLY_PATCH_PATH.write_bytes(data)
     APPLY_PATCH_PATH.chmod(0o755)
@@ -8,11 +8,15 @@ Contract: chat(), default_model(), available_models(), add_usage().
 
 from __future__ import annotations
 
+import collections
 import logging
+import math
 import os
+import pathlib
+import threading
 import time
 import json as _json
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 import httpx
 
@@ -30,15 +34,155 @@ def _get_http() -> httpx.Client:
     return _http
 
 
+# Per-process cap on in-flight chat requests to one API host (chat agent,
+# background consciousness and tool threads all share it).
+# Override via OUROBOROS_LLM_MAX_CONCURRENCY.
+DEFAULT_MAX_CONCURRENCY = 4
+_host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+
+def _host_semaphore(base_url: str) -> threading.BoundedSemaphore:
+    """Return the shared concurrency limiter for the API host behind base_url."""
+    host = httpx.URL(base_url).host
+    sem = _host_semaphores.get(host)
+    if sem is None:
+        with _host_semaphores_lock:
+            sem = _host_semaphores.get(host)
+            if sem is None:
+                try:
+                    limit = int(os.environ.get("OUROBOROS_LLM_MAX_CONCURRENCY", "") or DEFAULT_MAX_CONCURRENCY)
+                except ValueError:
+                    limit = DEFAULT_MAX_CONCURRENCY
+                sem = threading.BoundedSemaphore(max(1, limit))
+                _host_semaphores[host] = sem
+    return sem
+
+
+# Per-host rate gate. Learns from rate-limit response headers (Retry-After on
+# 429, x-ratelimit-remaining/-reset) and holds requests we know would be
+# rejected until the window resets, so retries don't burn RTTs (or tokens).
+# Optionally also enforces a client-side requests-per-minute budget via
+# OUROBOROS_LLM_MAX_RPM (0 = off).
+RATE_GATE_MAX_WAIT_SEC = 60.0
+
+
+def _parse_reset_seconds(value: str, now: float) -> Optional[float]:
+    """Seconds until reset from a Retry-After / x-ratelimit-reset style header value."""
+    v = str(value or "").strip()
+    if not v:
+        return None
+    try:
+        num = float(v)
+    except ValueError:
+        num = None
+    if num is not None:
+        if num > 1e12:  # epoch milliseconds (OpenRouter)
+            return num / 1000.0 - now
+        if num > 1e9:  # epoch seconds
+            return num - now
+        return num  # delta seconds (Retry-After)
+    # Durations like "1m30s", "250ms", "6m0s" (OpenAI style)
+    total, num_buf, i = 0.0, "", 0
+    while i < len(v):
+        c = v[i]
+        if c.isdigit() or c == ".":
+            num_buf += c
+        elif v.startswith("ms", i) and num_buf:
+            total += float(num_buf) / 1000.0
+            num_buf = ""
+            i += 1
+        elif c in "hms" and num_buf:
+            total += float(num_buf) * {"h": 3600.0, "m": 60.0, "s": 1.0}[c]
+            num_buf = ""
+        else:
+            return None
+        i += 1
+    return total if not num_buf else None
+
+
+class _RateGate:
+    def __init__(self, max_rpm: int = 0):
+        self._lock = threading.Lock()
+        self._blocked_until = 0.0
+        self._max_rpm = max(0, int(max_rpm))
+        self._sent: Deque[float] = collections.deque()
+
+    def wait(self) -> None:
+        """Block until a request may be sent (bounded by RATE_GATE_MAX_WAIT_SEC)."""
+        deadline = time.time() + RATE_GATE_MAX_WAIT_SEC
+        while True:
+            with self._lock:
+                now = time.time()
+                delay = self._blocked_until - now
+                if self._max_rpm:
+                    while self._sent and now - self._sent[0] >= 60.0:
+                        self._sent.popleft()
+                    if len(self._sent) >= self._max_rpm:
+                        delay = max(delay, 60.0 - (now - self._sent[0]))
+                if delay <= 0 or now >= deadline:
+                    if self._max_rpm:
+                        self._sent.append(now)
+                    return
+            time.sleep(min(delay, max(0.0, deadline - now)))
+
+    def observe(self, status_code: int, headers: Any) -> None:
+        """Update the gate from a response's status and rate-limit headers."""
+        now = time.time()
+        wait: Optional[float] = None
+        if status_code == 429:
+            wait = _parse_reset_seconds(headers.get("retry-after", ""), now)
+            if wait is None:
+                wait = _parse_reset_seconds(headers.get("x-ratelimit-reset", ""), now)
+        else:
+            remaining = headers.get("x-ratelimit-remaining-requests") or headers.get("x-ratelimit-remaining")
+            try:
+                exhausted = remaining is not None and int(float(remaining)) <= 0
+            except ValueError:
+                exhausted = False
+            if exhausted:
+                wait = _parse_reset_seconds(
+                    headers.get("x-ratelimit-reset-requests") or headers.get("x-ratelimit-reset", ""), now)
+        if wait is not None and wait > 0:
+            with self._lock:
+                self._blocked_until = max(self._blocked_until, now + min(wait, RATE_GATE_MAX_WAIT_SEC))
+
+
+_rate_gates: Dict[str, _RateGate] = {}
+
+
+def _rate_gate(base_url: str) -> _RateGate:
+    """Return the shared rate gate for the API host behind base_url."""
+    host = httpx.URL(base_url).host
+    gate = _rate_gates.get(host)
+    if gate is None:
+        with _host_semaphores_lock:
+            gate = _rate_gates.get(host)
+            if gate is None:
+                try:
+                    max_rpm = int(os.environ.get("OUROBOROS_LLM_MAX_RPM", "") or 0)
+                except ValueError:
+                    max_rpm = 0
+                gate = _RateGate(max_rpm)
+                _rate_gates[host] = gate
+    return gate
+
+
+_REASONING_ORDER: Dict[str, int] = {"none": 0, "minimal": 1, "low": 2, "medium": 3, "high": 4, "xhigh": 5}
+
+
 def normalize_reasoning_effort(value: str, default: str = "medium") -> str:
-    allowed = {"none", "minimal", "low", "medium", "high", "xhigh"}
+    if value in _REASONING_ORDER:  # already canonical: skip strip/lower
+        return value
     v = str(value or "").strip().lower()
-    return v if v in allowed else default
+    return v if v in _REASONING_ORDER else default
 
 
 def reasoning_rank(value: str) -> int:
-    order = {"none": 0, "minimal": 1, "low": 2, "medium": 3, "high": 4, "xhigh": 5}
-    return int(order.get(str(value or "").strip().lower(), 3))
+    rank = _REASONING_ORDER.get(value)
+    if rank is None:
+        rank = _REASONING_ORDER.get(str(value or "").strip().lower(), 3)
+    return rank
 
 
 def add_usage(total: Dict[str, Any], usage: Dict[str, Any]) -> None:
@@ -49,8 +193,58 @@ def add_usage(total: Dict[str, Any], usage: Dict[str, Any]) -> None:
         total["cost"] = float(total.get("cost") or 0) + float(usage["cost"])
 
 
-def fetch_openrouter_pricing() -> Dict[str, Tuple[float, float, float]]:
-    """Fetch current pricing from API. Returns {model_id: (input_per_1m, cached_per_1m, output_per_1m)}."""
+# On-disk pricing cache shared by the supervisor and all worker processes,
+# so each fresh process doesn't re-download the full /v1/models document.
+# Lives in the per-user cache dir (not the shared temp dir) so other local
+# users can't plant prices, and is shape-checked before use.
+PRICING_CACHE_PATH = pathlib.Path(
+    os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+) / "ouroboros" / "pricing_cache.json"
+PRICING_CACHE_TTL_SEC = 6 * 3600
+
+
+def _valid_price(v: Any) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v) and v >= 0
+
+
+def _read_pricing_cache(path: pathlib.Path, ttl_sec: float) -> Optional[Dict[str, Tuple[float, float, float]]]:
+    """Return cached pricing if the cache file is fresh and well-formed, else None."""
+    try:
+        if (time.time() - path.stat().st_mtime) > ttl_sec:
+            return None
+        raw = _json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not isinstance(raw, dict):
+        return None
+    pricing: Dict[str, Tuple[float, float, float]] = {}
+    for k, v in raw.items():
+        if not (isinstance(v, list) and len(v) == 3 and all(_valid_price(x) for x in v)):
+            log.warning("Ignoring malformed pricing cache %s (entry %r)", path, k)
+            return None
+        pricing[k] = (float(v[0]), float(v[1]), float(v[2]))
+    return pricing
+
+
+def _write_pricing_cache(path: pathlib.Path, pricing: Dict[str, Tuple[float, float, float]]) -> None:
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp.{os.getpid()}")
+        tmp.write_text(_json.dumps(pricing), encoding="utf-8")
+        os.replace(tmp, path)
+    except Exception:
+        log.debug("Failed to write pricing cache to %s", path, exc_info=True)
+
+
+def fetch_openrouter_pricing(use_cache: bool = True) -> Dict[str, Tuple[float, float, float]]:
+    """Fetch current pricing from API. Returns {model_id: (input_per_1m, cached_per_1m, output_per_1m)}.
+
+    Results are cached on disk for PRICING_CACHE_TTL_SEC; pass use_cache=False to force a refetch.
+    """
+    if use_cache:
+        cached = _read_pricing_cache(PRICING_CACHE_PATH, PRICING_CACHE_TTL_SEC)
+        if cached:
+            return cached
     try:
         resp = _get_http().get("https://oogg.top/v1/models", timeout=15,
                                headers={"Authorization": f"Bearer {os.environ.get('OPENROUTER_API_KEY', '')}"})
@@ -74,6 +268,8 @@ def fetch_openrouter_pricing() -> Dict[str, Tuple[float, float, float]]:
             output_per_1m = raw_completion * 1_000_000
             cached_per_1m = raw_cached * 1_000_000 if raw_cached is not None else input_per_1m * 0.1
             pricing_dict[model_id] = (input_per_1m, cached_per_1m, output_per_1m)
+        if pricing_dict:
+            _write_pricing_cache(PRICING_CACHE_PATH, pricing_dict)
         return pricing_dict
     except Exception as e:
         log.warning(f"Failed to fetch pricing: {e}")
@@ -101,7 +297,11 @@ class LLMClient:
     def _post(self, path: str, body: Dict[str, Any], timeout: float = 600) -> Dict[str, Any]:
         """POST to API and return parsed JSON. Raises on HTTP error."""
         url = f"{self._base_url}{path}"
-        resp = _get_http().post(url, headers=self._headers(), json=body, timeout=timeout)
+        gate = _rate_gate(self._base_url)
+        gate.wait()
+        with _host_semaphore(self._base_url):
+            resp = _get_http().post(url, headers=self._headers(), json=body, timeout=timeout)
+        gate.observe(resp.status_code, resp.headers)
         if resp.status_code != 200:
             raise RuntimeError(f"LLM API error {resp.status_code}: {resp.text[:500]}")
         return resp.json()
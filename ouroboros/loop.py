@@ -47,6 +47,8 @@ _MODEL_PRICING_STATIC = {
 _pricing_fetched = False
 _cached_pricing = None
 _pricing_lock = threading.Lock()
+# model id -> resolved pricing (exact or longest-prefix match), rebuilt when pricing changes
+_resolved_pricing: Dict[str, Optional[Tuple[float, float, float]]] = {}
 
 def _get_pricing() -> Dict[str, Tuple[float, float, float]]:
     """
@@ -80,24 +82,31 @@ def _get_pricing() -> Dict[str, Tuple[float, float, float]]:
             # Reset flag so we retry next time
             _pricing_fetched = False
 
+        _resolved_pricing.clear()
         return _cached_pricing
 
-def _estimate_cost(model: str, prompt_tokens: int, completion_tokens: int,
-                   cached_tokens: int = 0, cache_write_tokens: int = 0) -> float:
-    """Estimate cost from token counts using known pricing. Returns 0 if model unknown."""
+def _resolve_pricing(model: str) -> Optional[Tuple[float, float, float]]:
+    """Look up pricing for a model: exact match, else longest known prefix. Memoized per model."""
     model_pricing = _get_pricing()
-    # Try exact match first
+    try:
+        return _resolved_pricing[model]
+    except KeyError:
+        pass
     pricing = model_pricing.get(model)
-    if not pricing:
-        # Try longest prefix match
-        best_match = None
+    if not pricing and model:
         best_length = 0
         for key, val in model_pricing.items():
-            if model and model.startswith(key):
-                if len(key) > best_length:
-                    best_match = val
-                    best_length = len(key)
-        pricing = best_match
+            if len(key) > best_length and model.startswith(key):
+                pricing = val
+                best_length = len(key)
+    _resolved_pricing[model] = pricing
+    return pricing
+
+
+def _estimate_cost(model: str, prompt_tokens: int, completion_tokens: int,
+                   cached_tokens: int = 0, cache_write_tokens: int = 0) -> float:
+    """Estimate cost from token counts using known pricing. Returns 0 if model unknown."""
+    pricing = _resolve_pricing(model)
     if not pricing:
         return 0.0
     input_price, cached_price, output_price = pricing
@@ -7,13 +7,12 @@ Contract: load scratchpad/identity, chat_history().
 
 from __future__ import annotations
 
-import json
 import logging
 import pathlib
 from collections import Counter
 from typing import Any, Dict, List, Optional
 
-from ouroboros.utils import utc_now_iso, read_text, write_text, append_jsonl, short
+from ouroboros.utils import utc_now_iso, read_text, read_tail_lines, write_text, append_jsonl, short, json_loads
 
 log = logging.getLogger(__name__)
 
@@ -81,14 +80,18 @@ class Memory:
             return "(chat history is empty)"
 
         try:
-            raw_lines = chat_path.read_text(encoding="utf-8").strip().split("\n")
+            if search:
+                raw_lines = chat_path.read_text(encoding="utf-8").strip().split("\n")
+            else:
+                # Only the last offset+count lines can be shown: tail-read them.
+                raw_lines = read_tail_lines(chat_path, max(0, offset) + max(0, count))
             entries = []
             for line in raw_lines:
                 line = line.strip()
                 if not line:
                     continue
                 try:
-                    entries.append(json.loads(line))
+                    entries.append(json_loads(line))
                 except Exception:
                     log.debug(f"Failed to parse JSON line in chat_history: {line[:100]}")
                     continue
@@ -129,15 +132,14 @@ class Memory:
         if not path.exists():
             return []
         try:
-            lines = path.read_text(encoding="utf-8").strip().split("\n")
-            tail = lines[-max_entries:] if max_entries < len(lines) else lines
+            tail = read_tail_lines(path, max_entries)
             entries = []
             for line in tail:
                 line = line.strip()
                 if not line:
                     continue
                 try:
-                    entries.append(json.loads(line))
+                    entries.append(json_loads(line))
                 except Exception:
                     log.debug(f"Failed to parse JSON line in read_jsonl_tail: {line[:100]}", exc_info=True)
                     continue
@@ -5,12 +5,11 @@ from __future__ import annotations
 import json
 import logging
 import os
-import uuid
 from pathlib import Path
 from typing import Any, Dict, List
 
 from ouroboros.tools.registry import ToolContext, ToolEntry
-from ouroboros.utils import utc_now_iso, write_text, run_cmd
+from ouroboros.utils import new_task_id, utc_now_iso, write_text, run_cmd
 
 log = logging.getLogger(__name__)
 
@@ -60,7 +59,7 @@ def _schedule_task(ctx: ToolContext, description: str, context: str = "", parent
         except Exception:
             pass
 
-    tid = uuid.uuid4().hex[:8]
+    tid = new_task_id()
     evt = {"type": "schedule_task", "description": description, "task_id": tid, "depth": new_depth, "ts": utc_now_iso()}
     if context:
         evt["context"] = context
@@ -338,7 +338,7 @@ def _patch_app_html(webapp_dir: Path) -> str:
 def _push_to_github(data: dict[str, Any]) -> str:
     """Push evolution.json to the repo's docs/ folder via GitHub API."""
     import base64
-    import requests
+    from ouroboros.utils import http_session
 
     token = os.environ.get("GITHUB_TOKEN", "").strip()
     if not token:
@@ -357,7 +357,7 @@ def _push_to_github(data: dict[str, Any]) -> str:
     }
 
     sha = None
-    r = requests.get(url, headers=headers, timeout=15)
+    r = http_session().get(url, headers=headers, timeout=15)
     if r.status_code == 200:
         sha = r.json().get("sha")
 
@@ -372,7 +372,7 @@ def _push_to_github(data: dict[str, Any]) -> str:
     if sha:
         payload["sha"] = sha
 
-    put_r = requests.put(url, headers=headers, json=payload, timeout=15)
+    put_r = http_session().put(url, headers=headers, json=payload, timeout=15)
     if put_r.status_code in [200, 201]:
         return f"pushed {len(data.get('points', []))} points to {file_path}"
     return f"error: {put_r.status_code} — {put_r.text[:200]}"
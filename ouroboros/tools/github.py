@@ -41,18 +41,28 @@ def _gh_cmd(args: List[str], ctx: ToolContext, timeout: int = 30, input_data: Op
         return f"⚠️ GH_ERROR: {e}"
 
 
+# repo_dir -> 'owner/repo'; the origin remote doesn't change within a process
+_REPO_SLUG_CACHE: Dict[str, str] = {}
+
+
 def _get_repo_slug(ctx: ToolContext) -> str:
     """Get 'owner/repo' from git remote."""
+    key = str(ctx.repo_dir)
+    cached = _REPO_SLUG_CACHE.get(key)
+    if cached:
+        return cached
     try:
         res = subprocess.run(
             ["gh", "repo", "view", "--json", "nameWithOwner", "-q", ".nameWithOwner"],
-            cwd=str(ctx.repo_dir),
+            cwd=key,
             capture_output=True,
             text=True,
             timeout=10,
         )
         if res.returncode == 0 and res.stdout.strip():
-            return res.stdout.strip()
+            slug = res.stdout.strip()
+            _REPO_SLUG_CACHE[key] = slug
+            return slug
     except Exception:
         log.debug("Failed to get repo slug from gh", exc_info=True)
     user = os.environ.get("GITHUB_USER", "")
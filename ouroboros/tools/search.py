@@ -4,12 +4,23 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import httpx
 
 from ouroboros.tools.registry import ToolContext, ToolEntry
 
+# Shared httpx client (lazy init): keeps the connection pool and TLS session
+# across searches instead of a fresh handshake per call.
+_http: Optional[httpx.Client] = None
+
+
+def _get_http() -> httpx.Client:
+    global _http
+    if _http is None:
+        _http = httpx.Client(timeout=60, headers={"User-Agent": "Mozilla/5.0"})
+    return _http
+
 
 def _web_search(ctx: ToolContext, query: str) -> str:
     api_key = os.environ.get("OPENAI_API_KEY", "")
@@ -18,12 +29,11 @@ def _web_search(ctx: ToolContext, query: str) -> str:
     try:
         base_url = os.environ.get("OUROBOROS_LLM_BASE_URL", "https://oogg.top/v1")
         model = os.environ.get("OUROBOROS_WEBSEARCH_MODEL", "gpt-5")
-        resp = httpx.post(
+        resp = _get_http().post(
             f"{base_url.rstrip('/')}/chat/completions",
             headers={
                 "Content-Type": "application/json",
                 "Authorization": f"Bearer {api_key}",
-                "User-Agent": "Mozilla/5.0",
             },
             json={
                 "model": model,
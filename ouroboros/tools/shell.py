@@ -12,7 +12,7 @@ import subprocess
 from typing import Any, Dict, List
 
 from ouroboros.tools.registry import ToolContext, ToolEntry
-from ouroboros.utils import utc_now_iso, run_cmd, append_jsonl, truncate_for_log
+from ouroboros.utils import utc_now_iso, run_cmd, append_jsonl, truncate_for_log, SUBPROCESS_PIPE_KW
 
 log = logging.getLogger(__name__)
 
@@ -71,7 +71,7 @@ def _run_shell(ctx: ToolContext, cmd, cwd: str = "") -> str:
     try:
         res = subprocess.run(
             cmd, cwd=str(work_dir),
-            capture_output=True, text=True, timeout=120,
+            capture_output=True, text=True, timeout=120, **SUBPROCESS_PIPE_KW,
         )
         out = res.stdout + ("\n--- STDERR ---\n" + res.stderr if res.stderr else "")
         if len(out) > 50000:
@@ -101,7 +101,7 @@ def _run_claude_cli(work_dir: str, prompt: str, env: dict) -> subprocess.Complet
 
     res = subprocess.run(
         primary_cmd, cwd=work_dir,
-        capture_output=True, text=True, timeout=300, env=env,
+        capture_output=True, text=True, timeout=300, env=env, **SUBPROCESS_PIPE_KW,
     )
 
     if res.returncode != 0:
@@ -111,7 +111,7 @@ def _run_claude_cli(work_dir: str, prompt: str, env: dict) -> subprocess.Complet
         ):
             res = subprocess.run(
                 legacy_cmd, cwd=work_dir,
-                capture_output=True, text=True, timeout=300, env=env,
+                capture_output=True, text=True, timeout=300, env=env, **SUBPROCESS_PIPE_KW,
             )
 
     return res
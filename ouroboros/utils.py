@@ -7,15 +7,23 @@ Does not import anything from ouroboros.* (zero dependency level).
 
 from __future__ import annotations
 
-import datetime as _dt
+import atexit
 import hashlib
 import json
 import logging
 import os
 import pathlib
+import queue
+import secrets
 import subprocess
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson as _orjson
+except ImportError:  # optional accelerator; stdlib json is the fallback
+    _orjson = None
 
 log = logging.getLogger(__name__)
 
@@ -24,8 +32,24 @@ log = logging.getLogger(__name__)
 # Time
 # ---------------------------------------------------------------------------
 
+_iso_second: Tuple[int, str] = (-1, "")
+
+
 def utc_now_iso() -> str:
-    return _dt.datetime.now(tz=_dt.timezone.utc).isoformat()
+    """Current UTC time, formatted exactly like datetime.now(timezone.utc).isoformat().
+
+    Formats from time.time_ns() and reuses the strftime'd prefix within the same
+    second, avoiding a datetime object per log line.
+    """
+    global _iso_second
+    sec, us = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_sec, prefix = _iso_second
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _iso_second = (sec, prefix)
+    if us:
+        return f"{prefix}.{us:06d}+00:00"
+    return f"{prefix}+00:00"
 
 
 # ---------------------------------------------------------------------------
@@ -36,6 +60,43 @@ def sha256_text(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
 
 
+def new_task_id() -> str:
+    """Short random task id (8 hex chars), without building a full UUID."""
+    return secrets.token_hex(4)
+
+
+# ---------------------------------------------------------------------------
+# JSON (orjson when available)
+# ---------------------------------------------------------------------------
+
+def json_dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize to a UTF-8 (non-ASCII-escaped) JSON string, optionally 2-space indented."""
+    if _orjson is not None:
+        try:
+            option = _orjson.OPT_NON_STR_KEYS | (_orjson.OPT_INDENT_2 if indent else 0)
+            return _orjson.dumps(obj, option=option).decode("utf-8")
+        except TypeError:
+            pass  # unsupported type or out-of-range int: let stdlib handle/raise
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes (no str round-trip with orjson)."""
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(obj, option=_orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def json_loads(data: Any) -> Any:
+    """Parse JSON from str or bytes."""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
 # ---------------------------------------------------------------------------
 # File I/O
 # ---------------------------------------------------------------------------
@@ -49,11 +110,61 @@ def write_text(path: pathlib.Path, content: str) -> None:
     path.write_text(content, encoding="utf-8")
 
 
-def append_jsonl(path: pathlib.Path, obj: Dict[str, Any]) -> None:
-    """Append a JSON object as a line to a JSONL file (concurrent-safe)."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    line = json.dumps(obj, ensure_ascii=False)
-    data = (line + "\n").encode("utf-8")
+def read_tail_lines(path: pathlib.Path, n: int, chunk_size: int = 8192) -> List[str]:
+    """Return the last n non-empty lines of a text file, reading backwards from EOF.
+
+    Reads only as many chunk_size blocks as needed to cover n lines, so the
+    cost is bounded by the tail size rather than the file size.
+    """
+    if n <= 0:
+        return []
+    with path.open("rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        buf = b""
+        while True:
+            step = min(chunk_size, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+            # Before BOF, the first segment may be a partial line: drop it.
+            segments = buf.split(b"\n")[1:] if pos > 0 else buf.split(b"\n")
+            lines = [seg for seg in segments if seg.strip()]
+            if pos == 0 or len(lines) >= n:
+                break
+    return [ln.decode("utf-8", errors="replace") for ln in lines[-n:]]
+
+
+def append_jsonl(path: pathlib.Path, obj: Dict[str, Any]) -> int:
+    """Append a JSON object as a line to a JSONL file (concurrent-safe).
+
+    Returns the number of bytes appended.
+    """
+    data = json_dumps_bytes(obj) + b"\n"
+    _append_jsonl_bytes(path, data)
+    return len(data)
+
+
+# path -> lock file path. A hit skips the resolve() + sha256 + mkdir that
+# every append would otherwise pay (each a Drive metadata round-trip on Colab).
+_JSONL_LOCK_PATHS: Dict[pathlib.Path, pathlib.Path] = {}
+_JSONL_LOCK_PATHS_MAX = 256
+
+
+def _jsonl_lock_path(path: pathlib.Path) -> pathlib.Path:
+    lock_path = _JSONL_LOCK_PATHS.get(path)
+    if lock_path is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path_hash = hashlib.sha256(str(path.resolve()).encode("utf-8")).hexdigest()[:12]
+        lock_path = path.parent / f".append_jsonl_{path_hash}.lock"
+        if len(_JSONL_LOCK_PATHS) >= _JSONL_LOCK_PATHS_MAX:
+            _JSONL_LOCK_PATHS.clear()
+        _JSONL_LOCK_PATHS[path] = lock_path
+    return lock_path
+
+
+def _append_jsonl_bytes(path: pathlib.Path, data: bytes) -> None:
+    """Append pre-encoded JSONL line(s) under the per-file lock in one write."""
+    lock_path = _jsonl_lock_path(path)
 
     lock_timeout_sec = 2.0
     lock_stale_sec = 10.0
@@ -61,8 +172,6 @@ def append_jsonl(path: pathlib.Path, obj: Dict[str, Any]) -> None:
     write_retries = 3
     retry_sleep_base_sec = 0.01
 
-    path_hash = hashlib.sha256(str(path.resolve()).encode("utf-8")).hexdigest()[:12]
-    lock_path = path.parent / f".append_jsonl_{path_hash}.lock"
     lock_fd = None
     lock_acquired = False
 
@@ -73,6 +182,9 @@ def append_jsonl(path: pathlib.Path, obj: Dict[str, Any]) -> None:
                 lock_fd = os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
                 lock_acquired = True
                 break
+            except FileNotFoundError:
+                # Directory removed since it was cached (e.g. logs/ wiped); recreate.
+                path.parent.mkdir(parents=True, exist_ok=True)
             except FileExistsError:
                 try:
                     stat = lock_path.stat()
@@ -101,8 +213,8 @@ def append_jsonl(path: pathlib.Path, obj: Dict[str, Any]) -> None:
 
         for attempt in range(write_retries):
             try:
-                with path.open("a", encoding="utf-8") as f:
-                    f.write(line + "\n")
+                with path.open("ab") as f:
+                    f.write(data)
                 return
             except Exception:
                 if attempt < write_retries - 1:
@@ -124,6 +236,138 @@ def append_jsonl(path: pathlib.Path, obj: Dict[str, Any]) -> None:
                 pass
 
 
+# ---------------------------------------------------------------------------
+# Deferred JSONL appends
+# ---------------------------------------------------------------------------
+# Diagnostic log lines that don't need to be on disk before the caller moves on
+# are queued and written by a daemon flusher thread, keeping lock-file + open +
+# write + close off hot paths (main loop, event drain). Call flush_jsonl()
+# before exec/exit; it also runs at interpreter exit.
+
+JSONL_FLUSH_INTERVAL_SEC = 0.5
+JSONL_FLUSH_MAX_PENDING = 256  # a burst this large wakes the flusher early
+
+_jsonl_pending: "queue.SimpleQueue[Tuple[pathlib.Path, Dict[str, Any]]]" = queue.SimpleQueue()
+_jsonl_flush_lock = threading.Lock()
+_jsonl_wake = threading.Event()
+_jsonl_flusher: Optional[threading.Thread] = None
+
+
+def append_jsonl_deferred(path: pathlib.Path, obj: Dict[str, Any]) -> None:
+    """Queue a JSONL append; written by the background flusher within
+    JSONL_FLUSH_INTERVAL_SEC, or sooner once JSONL_FLUSH_MAX_PENDING lines are queued."""
+    _jsonl_pending.put((path, obj))
+    if _jsonl_flusher is None:
+        _start_jsonl_flusher()
+    if _jsonl_pending.qsize() >= JSONL_FLUSH_MAX_PENDING:
+        _jsonl_wake.set()
+
+
+def flush_jsonl() -> None:
+    """Synchronously write all queued deferred JSONL lines, in order.
+
+    Lines are grouped per file so each file gets one locked write per flush.
+    """
+    with _jsonl_flush_lock:
+        buffers: Dict[pathlib.Path, List[bytes]] = {}
+        while True:
+            try:
+                path, obj = _jsonl_pending.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                buffers.setdefault(path, []).append(json_dumps_bytes(obj) + b"\n")
+            except Exception:
+                log.warning("Dropping unserializable deferred JSONL line for %s", path, exc_info=True)
+        for path, lines in buffers.items():
+            _append_jsonl_bytes(path, b"".join(lines))
+
+
+def _jsonl_flusher_loop() -> None:
+    while True:
+        _jsonl_wake.wait(JSONL_FLUSH_INTERVAL_SEC)
+        _jsonl_wake.clear()
+        try:
+            flush_jsonl()
+        except Exception:
+            log.warning("Deferred JSONL flush failed", exc_info=True)
+
+
+def _start_jsonl_flusher() -> None:
+    global _jsonl_flusher
+    with _jsonl_flush_lock:
+        if _jsonl_flusher is None:
+            _jsonl_flusher = threading.Thread(target=_jsonl_flusher_loop, name="jsonl-flusher", daemon=True)
+            _jsonl_flusher.start()
+
+
+def _reset_jsonl_after_fork() -> None:
+    # Threads don't survive fork; lines queued by the parent are the parent's to write.
+    global _jsonl_pending, _jsonl_flush_lock, _jsonl_wake, _jsonl_flusher
+    _jsonl_pending = queue.SimpleQueue()
+    _jsonl_flush_lock = threading.Lock()
+    _jsonl_wake = threading.Event()
+    _jsonl_flusher = None
+
+
+atexit.register(flush_jsonl)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_jsonl_after_fork)
+
+
+# ---------------------------------------------------------------------------
+# HTTP sessions
+# ---------------------------------------------------------------------------
+# requests is imported lazily: utils stays importable without it.
+
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_http_session: Any = None
+
+
+def make_http_session(total_retries: int = 3, backoff_factor: float = 0.8) -> Any:
+    """Build a pooled requests.Session that retries connect errors and 429/5xx.
+
+    Retry-After headers are honoured. After the last retry the final response
+    is returned (not raised), so callers keep their raise_for_status() paths.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=total_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def http_session() -> Any:
+    """Process-wide shared session from make_http_session() (recreated after fork)."""
+    global _http_session
+    if _http_session is None:
+        _http_session = make_http_session()
+    return _http_session
+
+
+def _reset_http_after_fork() -> None:
+    # Pooled sockets must not be shared between parent and child.
+    global _http_session
+    _http_session = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_http_after_fork)
+
+
 # ---------------------------------------------------------------------------
 # Path safety
 # ---------------------------------------------------------------------------
@@ -166,8 +410,27 @@ def estimate_tokens(text: str) -> int:
 # Subprocess
 # ---------------------------------------------------------------------------
 
+SUBPROCESS_PIPE_BYTES = 1024 * 1024
+
+
+def _subprocess_pipe_kw() -> Dict[str, int]:
+    # Popen(pipesize=) is Linux-only (F_SETPIPE_SZ) and fails with EPERM above
+    # /proc/sys/fs/pipe-max-size for unprivileged users, so clamp to it.
+    try:
+        limit = int(pathlib.Path("/proc/sys/fs/pipe-max-size").read_text())
+    except (OSError, ValueError):
+        return {}
+    return {"pipesize": min(SUBPROCESS_PIPE_BYTES, limit)}
+
+
+# Splat into subprocess.run(..., capture_output=True) calls that can produce a
+# lot of output: a larger pipe means fewer child write stalls and parent wakeups.
+SUBPROCESS_PIPE_KW: Dict[str, int] = _subprocess_pipe_kw()
+
+
 def run_cmd(cmd: List[str], cwd: Optional[pathlib.Path] = None) -> str:
-    res = subprocess.run(cmd, cwd=str(cwd) if cwd else None, capture_output=True, text=True)
+    res = subprocess.run(cmd, cwd=str(cwd) if cwd else None, capture_output=True, text=True,
+                         **SUBPROCESS_PIPE_KW)
     if res.returncode != 0:
         raise RuntimeError(
             f"Command failed: {' '.join(cmd)}\n\nSTDOUT:\n{res.stdout}\n\nSTDERR:\n{res.stderr}"
@@ -7,16 +7,18 @@ Clone, checkout, reset, rescue snapshots, dependency sync, import test.
 from __future__ import annotations
 
 import datetime
-import json
+import hashlib
 import logging
 import os
 import pathlib
 import shutil
+import stat
 import subprocess
 import sys
-import uuid
+import tempfile
 from typing import Any, Dict, List, Optional, Tuple
 
+from ouroboros.utils import SUBPROCESS_PIPE_KW, json_dumps, new_task_id, utc_now_iso
 from supervisor.state import (
     load_state, save_state, append_jsonl, atomic_write_text,
 )
@@ -49,7 +51,7 @@ def init(repo_dir: pathlib.Path, drive_root: pathlib.Path, remote_url: str,
 # ---------------------------------------------------------------------------
 
 def git_capture(cmd: List[str]) -> Tuple[int, str, str]:
-    r = subprocess.run(cmd, cwd=str(REPO_DIR), capture_output=True, text=True)
+    r = subprocess.run(cmd, cwd=str(REPO_DIR), capture_output=True, text=True, **SUBPROCESS_PIPE_KW)
     return r.returncode, (r.stdout or "").strip(), (r.stderr or "").strip()
 
 
@@ -70,6 +72,30 @@ def ensure_repo_present() -> None:
 # Repo sync state collection
 # ---------------------------------------------------------------------------
 
+def _xy(code: str) -> str:
+    return code.replace(".", " ")
+
+
+def _porcelain_v2_to_short(line: str) -> str:
+    """Render a `git status --porcelain=v2` entry as its v1 short-format line."""
+    kind = line[:1]
+    if kind in ("?", "!"):
+        return f"{kind}{kind} {line[2:]}"
+    if kind == "1":
+        parts = line.split(" ", 8)
+        return f"{_xy(parts[1])} {parts[8]}" if len(parts) == 9 else line
+    if kind == "2":
+        parts = line.split(" ", 9)
+        if len(parts) == 10:
+            path, _, orig = parts[9].partition("\t")
+            return f"{_xy(parts[1])} {orig} -> {path}" if orig else f"{_xy(parts[1])} {path}"
+        return line
+    if kind == "u":
+        parts = line.split(" ", 10)
+        return f"{_xy(parts[1])} {parts[10]}" if len(parts) == 11 else line
+    return line
+
+
 def _collect_repo_sync_state() -> Dict[str, Any]:
     state: Dict[str, Any] = {
         "current_branch": "unknown",
@@ -78,30 +104,38 @@ def _collect_repo_sync_state() -> Dict[str, Any]:
         "warnings": [],
     }
 
-    rc, branch, err = git_capture(["git", "rev-parse", "--abbrev-ref", "HEAD"])
-    if rc == 0 and branch:
-        state["current_branch"] = branch
-    elif err:
-        state["warnings"].append(f"branch_error:{err}")
-
-    rc, dirty, err = git_capture(["git", "status", "--porcelain"])
-    if rc == 0 and dirty:
-        state["dirty_lines"] = [ln for ln in dirty.splitlines() if ln.strip()]
-    elif rc != 0 and err:
-        state["warnings"].append(f"status_error:{err}")
+    # One status call yields branch, upstream, ahead/behind and dirty entries.
+    rc, out, err = git_capture(["git", "status", "--porcelain=v2", "--branch"])
+    if rc != 0:
+        if err:
+            state["warnings"].append(f"status_error:{err}")
+        return state
 
     upstream = ""
-    rc, up, err = git_capture(["git", "rev-parse", "--abbrev-ref", "--symbolic-full-name", "@{u}"])
-    if rc == 0 and up:
-        upstream = up
-    else:
+    ahead: Optional[int] = None
+    dirty: List[str] = []
+    for ln in out.splitlines():
+        if ln.startswith("# branch.head "):
+            head = ln[len("# branch.head "):].strip()
+            state["current_branch"] = "HEAD" if head == "(detached)" else head
+        elif ln.startswith("# branch.upstream "):
+            upstream = ln[len("# branch.upstream "):].strip()
+        elif ln.startswith("# branch.ab "):
+            try:
+                ahead = int(ln.split()[2].lstrip("+"))
+            except (IndexError, ValueError):
+                ahead = None
+        elif ln.strip() and not ln.startswith("#"):
+            dirty.append(_porcelain_v2_to_short(ln))
+    state["dirty_lines"] = dirty
+
+    if not upstream:
         current_branch = str(state.get("current_branch") or "")
         if current_branch not in ("", "HEAD", "unknown"):
             upstream = f"origin/{current_branch}"
-        elif err:
-            state["warnings"].append(f"upstream_error:{err}")
 
-    if upstream:
+    # Only list unpushed commits when there are some (or ahead is unknown).
+    if upstream and (ahead is None or ahead > 0):
         rc, unpushed, err = git_capture(["git", "log", "--oneline", f"{upstream}..HEAD"])
         if rc == 0 and unpushed:
             state["unpushed_lines"] = [ln for ln in unpushed.splitlines() if ln.strip()]
@@ -126,24 +160,27 @@ def _copy_untracked_for_rescue(dst_root: pathlib.Path, max_files: int = 200,
         return out
 
     dst_root.mkdir(parents=True, exist_ok=True)
+    repo_root = REPO_DIR.resolve()
     for rel in lines:
         if out["copied_files"] >= max_files:
             out["truncated"] = True
             break
-        src = (REPO_DIR / rel).resolve()
+        src = (repo_root / rel).resolve()
         try:
-            src.relative_to(REPO_DIR.resolve())
+            src.relative_to(repo_root)
         except Exception:
             out["skipped_files"] += 1
             continue
-        if not src.exists() or not src.is_file():
+        # One stat answers exists / is-regular-file / size.
+        try:
+            st = os.stat(src)
+        except OSError:
             out["skipped_files"] += 1
             continue
-        try:
-            size = int(src.stat().st_size)
-        except Exception:
+        if not stat.S_ISREG(st.st_mode):
             out["skipped_files"] += 1
             continue
+        size = int(st.st_size)
         if (out["copied_bytes"] + size) > max_total_bytes:
             out["truncated"] = True
             break
@@ -162,7 +199,7 @@ def _create_rescue_snapshot(branch: str, reason: str,
                              repo_state: Dict[str, Any]) -> Dict[str, Any]:
     now = datetime.datetime.now(datetime.timezone.utc)
     ts = now.strftime("%Y%m%d_%H%M%S")
-    rescue_dir = DRIVE_ROOT / "archive" / "rescue" / f"{ts}_{uuid.uuid4().hex[:8]}"
+    rescue_dir = DRIVE_ROOT / "archive" / "rescue" / f"{ts}_{new_task_id()}"
     rescue_dir.mkdir(parents=True, exist_ok=True)
 
     info: Dict[str, Any] = {
@@ -197,7 +234,7 @@ def _create_rescue_snapshot(branch: str, reason: str,
                           "\n".join(unpushed_lines) + "\n")
 
     atomic_write_text(rescue_dir / "rescue_meta.json",
-                      json.dumps(info, ensure_ascii=False, indent=2))
+                      json_dumps(info, indent=True))
     return info
 
 
@@ -205,6 +242,23 @@ def _create_rescue_snapshot(branch: str, reason: str,
 # Checkout + reset
 # ---------------------------------------------------------------------------
 
+def _remove_pycache_dirs(root: pathlib.Path) -> None:
+    """Delete __pycache__ dirs under root (scandir walk; skips .git and symlinks)."""
+    stack = [str(root)]
+    while stack:
+        try:
+            entries = list(os.scandir(stack.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False) or entry.name == ".git":
+                continue
+            if entry.name == "__pycache__":
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                stack.append(entry.path)
+
+
 def checkout_and_reset(branch: str, reason: str = "unspecified",
                        unsynced_policy: str = "ignore") -> Tuple[bool, str]:
     rc, _, err = git_capture(["git", "fetch", "origin"])
@@ -213,7 +267,7 @@ def checkout_and_reset(branch: str, reason: str = "unspecified",
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": utc_now_iso(),
                 "type": "reset_fetch_failed",
                 "target_branch": branch, "reason": reason, "error": msg,
             },
@@ -254,7 +308,7 @@ def checkout_and_reset(branch: str, reason: str = "unspecified",
                 append_jsonl(
                     DRIVE_ROOT / "logs" / "supervisor.jsonl",
                     {
-                        "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                        "ts": utc_now_iso(),
                         "type": "reset_blocked_unsynced_state",
                         "target_branch": branch, "reason": reason, "policy": policy,
                         "current_branch": repo_state.get("current_branch"),
@@ -271,7 +325,7 @@ def checkout_and_reset(branch: str, reason: str = "unspecified",
             append_jsonl(
                 DRIVE_ROOT / "logs" / "supervisor.jsonl",
                 {
-                    "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    "ts": utc_now_iso(),
                     "type": "reset_unsynced_rescued_then_reset",
                     "target_branch": branch, "reason": reason, "policy": policy,
                     "current_branch": repo_state.get("current_branch"),
@@ -293,7 +347,7 @@ def checkout_and_reset(branch: str, reason: str = "unspecified",
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": utc_now_iso(),
                 "type": "reset_branch_missing",
                 "target_branch": branch, "reason": reason,
             },
@@ -303,8 +357,7 @@ def checkout_and_reset(branch: str, reason: str = "unspecified",
     subprocess.run(["git", "checkout", branch], cwd=str(REPO_DIR), check=True)
     subprocess.run(["git", "reset", "--hard", f"origin/{branch}"], cwd=str(REPO_DIR), check=True)
     # Clean __pycache__ to prevent stale bytecode (git checkout may not update mtime)
-    for p in REPO_DIR.rglob("__pycache__"):
-        shutil.rmtree(p, ignore_errors=True)
+    _remove_pycache_dirs(REPO_DIR)
     st = load_state()
     st["current_branch"] = branch
     st["current_sha"] = subprocess.run(
@@ -319,22 +372,47 @@ def checkout_and_reset(branch: str, reason: str = "unspecified",
 # Dependencies + import test
 # ---------------------------------------------------------------------------
 
+def _deps_marker_path() -> pathlib.Path:
+    # VM-local on purpose: a fresh Colab VM keeps Drive but loses pip installs.
+    return pathlib.Path(tempfile.gettempdir()) / "ouroboros_deps_ok.txt"
+
+
 def sync_runtime_dependencies(reason: str) -> Tuple[bool, str]:
+    """pip-install requirements.txt (or a minimal fallback set).
+
+    A successful install is remembered per (requirements hash, interpreter),
+    so restarts with unchanged requirements skip pip entirely.
+    """
     req_path = REPO_DIR / "requirements.txt"
     cmd: List[str] = [sys.executable, "-m", "pip", "install", "-q"]
     source = ""
-    if req_path.exists():
+    try:
+        req_bytes = req_path.read_bytes()
+    except OSError:
+        req_bytes = None
+    if req_bytes is not None:
         cmd += ["-r", str(req_path)]
         source = f"requirements:{req_path}"
     else:
         cmd += ["openai>=1.0.0", "requests"]
         source = "fallback:minimal"
+    stamp = f"{hashlib.sha256(req_bytes or b'').hexdigest()} {sys.executable}"
+    marker = _deps_marker_path()
+    try:
+        if marker.read_text(encoding="utf-8").strip() == stamp:
+            return True, f"{source} (cached)"
+    except OSError:
+        pass
     try:
         subprocess.run(cmd, cwd=str(REPO_DIR), check=True)
+        try:
+            atomic_write_text(marker, stamp + "\n", durable=False)
+        except OSError:
+            log.debug("Failed to record deps sync", exc_info=True)
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": utc_now_iso(),
                 "type": "deps_sync_ok", "reason": reason, "source": source,
             },
         )
@@ -344,19 +422,46 @@ def sync_runtime_dependencies(reason: str) -> Tuple[bool, str]:
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": utc_now_iso(),
                 "type": "deps_sync_error", "reason": reason, "source": source, "error": msg,
             },
         )
         return False, msg
 
 
+def _import_test_marker_path() -> pathlib.Path:
+    # VM-local like the deps marker: whether the import succeeds depends on
+    # this VM's installed packages, not just the commit.
+    return pathlib.Path(tempfile.gettempdir()) / "ouroboros_import_ok.txt"
+
+
 def import_test() -> Dict[str, Any]:
+    """Import-check the checked-out tree in a fresh interpreter.
+
+    A pass is remembered per (HEAD sha, interpreter) in a VM-local marker, so
+    restarting onto an already-verified commit skips the interpreter spawn.
+    An in-process import can't replace the subprocess: the supervisor already
+    has the previous checkout's modules loaded.
+    """
+    sha = str(load_state().get("current_sha") or "")
+    marker = _import_test_marker_path()
+    stamp = f"{sha} {sys.executable}"
+    if sha:
+        try:
+            if marker.read_text(encoding="utf-8").strip() == stamp:
+                return {"ok": True, "stdout": "import_ok (cached)\n", "stderr": "", "returncode": 0}
+        except OSError:
+            pass
     r = subprocess.run(
-        ["python3", "-c", "import ouroboros, ouroboros.agent; print('import_ok')"],
+        [sys.executable, "-c", "import ouroboros, ouroboros.agent; print('import_ok')"],
         cwd=str(REPO_DIR),
         capture_output=True, text=True,
     )
+    if r.returncode == 0 and sha:
+        try:
+            atomic_write_text(marker, stamp + "\n", durable=False)
+        except OSError:
+            log.debug("Failed to record import_test pass", exc_info=True)
     return {"ok": (r.returncode == 0), "stdout": r.stdout, "stderr": r.stderr,
             "returncode": r.returncode}
 
@@ -399,7 +504,7 @@ def safe_restart(
     append_jsonl(
         DRIVE_ROOT / "logs" / "supervisor.jsonl",
         {
-            "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "ts": utc_now_iso(),
             "type": "safe_restart_dev_import_failed",
             "reason": reason,
             "branch": BRANCH_DEV,
@@ -6,21 +6,21 @@ Queue operations, priority, timeouts, persistence, evolution/review scheduling.
 
 from __future__ import annotations
 
+import bisect
 import datetime
-import json
 import logging
 import pathlib
 import threading
 import time
-import uuid
 from typing import Any, Dict, List, Optional, Tuple
 
 from supervisor.state import (
-    load_state, save_state, append_jsonl, atomic_write_text,
+    load_state, peek_state, save_state, append_jsonl, atomic_write_text,
     QUEUE_SNAPSHOT_PATH, budget_pct, TOTAL_BUDGET_LIMIT,
     budget_remaining, EVOLUTION_BUDGET_RESERVE,
 )
 from supervisor.telegram import send_with_budget
+from ouroboros.utils import json_dumps, json_loads, new_task_id, utc_now_iso
 
 log = logging.getLogger(__name__)
 
@@ -45,6 +45,156 @@ def init(drive_root: pathlib.Path, soft_timeout: int, hard_timeout: int) -> None
 # ---------------------------------------------------------------------------
 # Queue data structures (references to workers module globals)
 # ---------------------------------------------------------------------------
+
+def _task_type_of(task: Any) -> str:
+    return str(task.get("type") or "") if isinstance(task, dict) else ""
+
+
+class TypeCountedList(list):
+    """PENDING list that keeps a per-task-type count and an id index in step.
+
+    Every mutator used on PENDING goes through here (bisect.insort calls
+    .insert() on list subclasses), so type and id lookups are O(1) instead
+    of a scan.
+    """
+
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+        self.type_counts: Dict[str, int] = {}
+        self.by_id: Dict[Any, Dict[str, Any]] = {}
+        self._recount()
+
+    def _recount(self) -> None:
+        counts: Dict[str, int] = {}
+        by_id: Dict[Any, Dict[str, Any]] = {}
+        for t in self:
+            tt = _task_type_of(t)
+            counts[tt] = counts.get(tt, 0) + 1
+            if isinstance(t, dict):
+                by_id[t.get("id")] = t
+        self.type_counts = counts
+        self.by_id = by_id
+
+    def _inc(self, task: Any) -> None:
+        tt = _task_type_of(task)
+        self.type_counts[tt] = self.type_counts.get(tt, 0) + 1
+        if isinstance(task, dict):
+            self.by_id[task.get("id")] = task
+
+    def _dec(self, task: Any) -> None:
+        tt = _task_type_of(task)
+        n = self.type_counts.get(tt, 0) - 1
+        if n > 0:
+            self.type_counts[tt] = n
+        else:
+            self.type_counts.pop(tt, None)
+        if isinstance(task, dict) and self.by_id.get(task.get("id")) is task:
+            del self.by_id[task.get("id")]
+
+    def append(self, task: Any) -> None:
+        super().append(task)
+        self._inc(task)
+
+    def insert(self, index: Any, task: Any) -> None:
+        super().insert(index, task)
+        self._inc(task)
+
+    def extend(self, tasks: Any) -> None:
+        super().extend(tasks)
+        self._recount()
+
+    def __iadd__(self, tasks: Any) -> "TypeCountedList":
+        self.extend(tasks)
+        return self
+
+    def pop(self, index: Any = -1) -> Any:
+        task = super().pop(index)
+        self._dec(task)
+        return task
+
+    def remove(self, task: Any) -> None:
+        super().remove(task)
+        self._dec(task)
+
+    def clear(self) -> None:
+        super().clear()
+        self.type_counts = {}
+        self.by_id = {}
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        super().__setitem__(index, value)
+        self._recount()
+
+    def __delitem__(self, index: Any) -> None:
+        super().__delitem__(index)
+        self._recount()
+
+
+class TypeCountedDict(dict):
+    """RUNNING dict (task_id -> meta) with a per-task-type count of meta["task"]."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.type_counts: Dict[str, int] = {}
+        for meta in self.values():
+            self._inc(meta)
+
+    @staticmethod
+    def _type(meta: Any) -> str:
+        return _task_type_of(meta.get("task")) if isinstance(meta, dict) else ""
+
+    def _inc(self, meta: Any) -> None:
+        tt = self._type(meta)
+        self.type_counts[tt] = self.type_counts.get(tt, 0) + 1
+
+    def _dec(self, meta: Any) -> None:
+        tt = self._type(meta)
+        n = self.type_counts.get(tt, 0) - 1
+        if n > 0:
+            self.type_counts[tt] = n
+        else:
+            self.type_counts.pop(tt, None)
+
+    def __setitem__(self, key: Any, meta: Any) -> None:
+        if key in self:
+            self._dec(dict.__getitem__(self, key))
+        super().__setitem__(key, meta)
+        self._inc(meta)
+
+    def __delitem__(self, key: Any) -> None:
+        self._dec(dict.__getitem__(self, key))
+        super().__delitem__(key)
+
+    _MISSING = object()
+
+    def pop(self, key: Any, default: Any = _MISSING) -> Any:
+        if key in self:
+            meta = super().pop(key)
+            self._dec(meta)
+            return meta
+        if default is TypeCountedDict._MISSING:
+            raise KeyError(key)
+        return default
+
+    def popitem(self) -> Tuple[Any, Any]:
+        key, meta = super().popitem()
+        self._dec(meta)
+        return key, meta
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, meta in dict(*args, **kwargs).items():
+            self[key] = meta
+
+    def clear(self) -> None:
+        super().clear()
+        self.type_counts = {}
+
+
 # These will be set by workers.init_queue_refs()
 PENDING: List[Dict[str, Any]] = []
 RUNNING: Dict[str, Dict[str, Any]] = {}
@@ -78,15 +228,16 @@ def _task_priority(task_type: str) -> int:
 
 
 def _queue_sort_key(task: Dict[str, Any]) -> Tuple[int, int]:
-    _pr = task.get("priority")
-    pr = int(_pr) if _pr is not None else _task_priority(str(task.get("type") or ""))
-    _seq = task.get("_queue_seq")
-    seq = int(_seq) if _seq is not None else 0
-    return pr, seq
+    # priority/_queue_seq are normalized to int by _prepare_task() on enqueue.
+    return task["priority"], task["_queue_seq"]
 
 
 def sort_pending() -> None:
-    """Sort PENDING queue by priority."""
+    """Sort PENDING queue by priority.
+
+    enqueue_task() keeps PENDING sorted on insert; this is only needed after
+    PENDING is mutated directly (and is O(n) on already-sorted input).
+    """
     PENDING.sort(key=_queue_sort_key)
 
 
@@ -94,54 +245,139 @@ def sort_pending() -> None:
 # Queue operations
 # ---------------------------------------------------------------------------
 
-def enqueue_task(task: Dict[str, Any], front: bool = False) -> Dict[str, Any]:
-    """Add task to PENDING queue."""
+def _prepare_task(task: Dict[str, Any], front: bool, queued_at: str) -> Dict[str, Any]:
+    # Coerce types once here so PENDING consumers can read fields directly.
     t = dict(task)
     QUEUE_SEQ_COUNTER_REF["value"] += 1
     seq = QUEUE_SEQ_COUNTER_REF["value"]
-    t.setdefault("priority", _task_priority(str(t.get("type") or "")))
+    _pr = t.get("priority")
+    t["priority"] = int(_pr) if _pr is not None else _task_priority(str(t.get("type") or ""))
     _att = t.get("_attempt")
-    t.setdefault("_attempt", int(_att) if _att is not None else 1)
+    t["_attempt"] = int(_att) if _att is not None else 1
     t["_queue_seq"] = -seq if front else seq
-    t["queued_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
-    PENDING.append(t)
-    sort_pending()
+    t["queued_at"] = queued_at
     return t
 
 
+def enqueue_task(task: Dict[str, Any], front: bool = False) -> Dict[str, Any]:
+    """Add task to PENDING queue."""
+    t = _prepare_task(task, front, utc_now_iso())
+    # O(log n) search + insert keeps PENDING sorted (and iterable in order for
+    # snapshots/status) without a full re-sort per enqueue.
+    bisect.insort(PENDING, t, key=_queue_sort_key)
+    return t
+
+
+def enqueue_tasks_bulk(tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Add many tasks to PENDING (FIFO among themselves) with a single sort."""
+    queued_at = utc_now_iso()
+    prepared = [_prepare_task(task, False, queued_at) for task in tasks]
+    PENDING.extend(prepared)
+    sort_pending()
+    return prepared
+
+
 def queue_has_task_type(task_type: str) -> bool:
     """Check if a task of given type exists in PENDING or RUNNING."""
     tt = str(task_type or "")
-    if any(str(t.get("type") or "") == tt for t in PENDING):
-        return True
+    return _pending_type_count(tt) > 0 or bool(running_task_type_counts().get(tt))
+
+
+def _pending_type_count(task_type: str) -> int:
+    counts = getattr(PENDING, "type_counts", None)
+    if counts is not None:
+        return counts.get(task_type, 0)
+    return sum(1 for t in PENDING if _task_type_of(t) == task_type)
+
+
+def drop_pending_by_type(task_type: str) -> int:
+    """Remove every PENDING task of task_type in place; return how many were dropped.
+
+    Checks the per-type count first, so the common nothing-to-drop case
+    skips the list rebuild. Filtering preserves PENDING's sorted order.
+    """
+    n = _pending_type_count(task_type)
+    if n:
+        PENDING[:] = [t for t in PENDING if _task_type_of(t) != task_type]
+    return n
+
+
+def running_task_type_counts() -> Dict[str, int]:
+    """Return {task_type: count} for RUNNING tasks."""
+    counts = getattr(RUNNING, "type_counts", None)
+    if counts is not None:
+        return dict(counts)
+    out: Dict[str, int] = {}
     for meta in RUNNING.values():
-        task = meta.get("task") if isinstance(meta, dict) else None
-        if isinstance(task, dict) and str(task.get("type") or "") == tt:
-            return True
+        tt = _task_type_of(meta.get("task")) if isinstance(meta, dict) else ""
+        out[tt] = out.get(tt, 0) + 1
+    return out
+
+
+# Snapshot writes are coalesced: hot paths call mark_snapshot_dirty() and the
+# main loop calls maybe_flush_snapshot() once per tick. The periodic refresh
+# keeps the file younger than restore_pending_from_snapshot()'s max age.
+SNAPSHOT_MIN_INTERVAL_SEC: float = 0.5
+SNAPSHOT_REFRESH_SEC: float = 60.0
+_SNAPSHOT_DIRTY: bool = False
+_SNAPSHOT_REASON: str = ""
+_LAST_SNAPSHOT_TS: float = 0.0
+_LAST_SNAPSHOT_KEY: Optional[int] = None
+
+
+def mark_snapshot_dirty(reason: str = "") -> None:
+    """Request a snapshot write on the next maybe_flush_snapshot()."""
+    global _SNAPSHOT_DIRTY, _SNAPSHOT_REASON
+    _SNAPSHOT_DIRTY = True
+    _SNAPSHOT_REASON = reason
+
+
+def maybe_flush_snapshot(min_interval: float = SNAPSHOT_MIN_INTERVAL_SEC) -> bool:
+    """Write the snapshot if dirty and min_interval has passed (or it is stale)."""
+    elapsed = time.time() - _LAST_SNAPSHOT_TS
+    if _SNAPSHOT_DIRTY and elapsed >= min_interval:
+        persist_queue_snapshot(reason=_SNAPSHOT_REASON)
+        return True
+    if elapsed >= SNAPSHOT_REFRESH_SEC:
+        persist_queue_snapshot(reason="refresh")
+        return True
     return False
 
 
+_SNAPSHOT_TASK_FIELDS = (
+    "id", "type", "chat_id", "text", "priority", "_attempt",
+    "review_reason", "review_source_task_id", "queued_at", "_queue_seq",
+)
+
+
+def _snapshot_key() -> int:
+    """Cheap content key for the snapshot (ignores ts/reason/runtime fields)."""
+    return hash((
+        tuple((t.get("id"), t.get("_queue_seq"), t.get("_attempt")) for t in PENDING),
+        tuple((task_id, meta.get("worker_id"), meta.get("attempt"), bool(meta.get("soft_sent")))
+              for task_id, meta in RUNNING.items()),
+    ))
+
+
 def persist_queue_snapshot(reason: str = "") -> None:
-    """Save PENDING and RUNNING to snapshot file."""
-    pending_rows = []
-    for t in PENDING:
-        pending_rows.append({
-            "id": t.get("id"), "type": t.get("type"), "priority": t.get("priority"),
-            "attempt": t.get("_attempt"), "queued_at": t.get("queued_at"),
-            "queue_seq": t.get("_queue_seq"),
-            "task": {
-                "id": t.get("id"), "type": t.get("type"), "chat_id": t.get("chat_id"),
-                "text": t.get("text"), "priority": t.get("priority"),
-                "_attempt": t.get("_attempt"), "review_reason": t.get("review_reason"),
-                "review_source_task_id": t.get("review_source_task_id"),
-            },
-        })
+    """Save PENDING and RUNNING to snapshot file (immediately; see maybe_flush_snapshot).
+
+    Skips serialization and the write when the queues are unchanged since the
+    last write and that write is younger than SNAPSHOT_REFRESH_SEC.
+    """
+    global _SNAPSHOT_DIRTY, _LAST_SNAPSHOT_TS, _LAST_SNAPSHOT_KEY
+    _SNAPSHOT_DIRTY = False
+    key = _snapshot_key()
+    if key == _LAST_SNAPSHOT_KEY and (time.time() - _LAST_SNAPSHOT_TS) < SNAPSHOT_REFRESH_SEC:
+        return
+    # One flat row per pending task; the row itself is what restore re-enqueues.
+    pending_rows = [{k: t.get(k) for k in _SNAPSHOT_TASK_FIELDS} for t in PENDING]
     running_rows = []
     now = time.time()
     for task_id, meta in RUNNING.items():
-        task = meta.get("task") if isinstance(meta, dict) else {}
-        started = float(meta.get("started_at") or 0.0) if isinstance(meta, dict) else 0.0
-        hb = float(meta.get("last_heartbeat_at") or 0.0) if isinstance(meta, dict) else 0.0
+        task = meta.get("task") or {}
+        started = meta.get("started_at") or 0.0
+        hb = meta.get("last_heartbeat_at") or 0.0
         running_rows.append({
             "id": task_id, "type": task.get("type"), "priority": task.get("priority"),
             "attempt": meta.get("attempt"), "worker_id": meta.get("worker_id"),
@@ -150,13 +386,15 @@ def persist_queue_snapshot(reason: str = "") -> None:
             "soft_sent": bool(meta.get("soft_sent")), "task": task,
         })
     payload = {
-        "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "ts": utc_now_iso(),
         "reason": reason,
         "pending_count": len(PENDING), "running_count": len(RUNNING),
         "pending": pending_rows, "running": running_rows,
     }
     try:
-        atomic_write_text(QUEUE_SNAPSHOT_PATH, json.dumps(payload, ensure_ascii=False, indent=2))
+        atomic_write_text(QUEUE_SNAPSHOT_PATH, json_dumps(payload), durable=False)
+        _LAST_SNAPSHOT_KEY = key
+        _LAST_SNAPSHOT_TS = time.time()
     except Exception:
         log.warning("Failed to persist queue snapshot (reason=%s)", reason, exc_info=True)
         pass
@@ -181,7 +419,7 @@ def restore_pending_from_snapshot(max_age_sec: int = 900) -> int:
     try:
         if not QUEUE_SNAPSHOT_PATH.exists():
             return 0
-        snap = json.loads(QUEUE_SNAPSHOT_PATH.read_text(encoding="utf-8"))
+        snap = json_loads(QUEUE_SNAPSHOT_PATH.read_bytes())
         if not isinstance(snap, dict):
             return 0
         ts = str(snap.get("ts") or "")
@@ -190,25 +428,28 @@ def restore_pending_from_snapshot(max_age_sec: int = 900) -> int:
             return 0
         if (time.time() - ts_unix) > max_age_sec:
             return 0
-        restored = 0
+        to_restore = []
         for row in (snap.get("pending") or []):
-            task = row.get("task") if isinstance(row, dict) else None
+            if not isinstance(row, dict):
+                continue
+            # Older snapshots nest the task under "task"; current rows are flat.
+            task = row.get("task") if "task" in row else row
             if not isinstance(task, dict):
                 continue
             if not task.get("id") or not task.get("chat_id"):
                 continue
-            enqueue_task(task)
-            restored += 1
+            to_restore.append(task)
+        restored = len(enqueue_tasks_bulk(to_restore)) if to_restore else 0
         if restored > 0:
             append_jsonl(
                 DRIVE_ROOT / "logs" / "supervisor.jsonl",
                 {
-                    "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    "ts": utc_now_iso(),
                     "type": "queue_restored_from_snapshot",
                     "restored_pending": restored,
                 },
             )
-            persist_queue_snapshot(reason="queue_restored")
+            mark_snapshot_dirty(reason="queue_restored")
         return restored
     except Exception:
         log.warning("Failed to restore pending queue from snapshot", exc_info=True)
@@ -221,25 +462,43 @@ def cancel_task_by_id(task_id: str) -> bool:
     from supervisor import workers
 
     with _queue_lock:
-        for i, t in enumerate(list(PENDING)):
-            if t["id"] == task_id:
-                PENDING.pop(i)
-                persist_queue_snapshot(reason="cancel_pending")
-                return True
-
-        # For RUNNING tasks, need to terminate worker
-        for w in workers.WORKERS.values():
-            if w.busy_task_id == task_id:
-                RUNNING.pop(task_id, None)
-                if w.proc.is_alive():
-                    w.proc.terminate()
-                w.proc.join(timeout=5)
-                workers.respawn_worker(w.wid)
-                persist_queue_snapshot(reason="cancel_running")
-                return True
+        i = _pending_index(task_id)
+        if i is not None:
+            PENDING.pop(i)
+            mark_snapshot_dirty(reason="cancel_pending")
+            return True
+
+        # For RUNNING tasks, need to terminate worker (RUNNING meta records which one)
+        meta = RUNNING.get(task_id)
+        w = workers.WORKERS.get(meta.get("worker_id")) if isinstance(meta, dict) else None
+        if w is None or w.busy_task_id != task_id:
+            w = next((w for w in workers.WORKERS.values() if w.busy_task_id == task_id), None)
+        if w is not None:
+            RUNNING.pop(task_id, None)
+            # Don't block the loop on the old process: it's reaped asynchronously
+            workers.terminate_later(w.proc, grace_sec=5.0)
+            workers.respawn_worker(w.wid)
+            mark_snapshot_dirty(reason="cancel_running")
+            return True
     return False
 
 
+def _pending_index(task_id: str) -> Optional[int]:
+    """Position of task_id in PENDING: id index + bisect on the sort key, else a scan."""
+    by_id = getattr(PENDING, "by_id", None)
+    t = by_id.get(task_id) if by_id is not None else None
+    if t is not None:
+        i = bisect.bisect_left(PENDING, _queue_sort_key(t), key=_queue_sort_key)
+        if i < len(PENDING) and PENDING[i] is t:
+            return i
+    # by_id keeps one task per id: after one of two duplicate ids is removed
+    # the survivor is only reachable by scanning.
+    for i, t in enumerate(PENDING):
+        if t.get("id") == task_id:
+            return i
+    return None
+
+
 # ---------------------------------------------------------------------------
 # Timeout enforcement
 # ---------------------------------------------------------------------------
@@ -252,29 +511,28 @@ def enforce_task_timeouts() -> None:
     if not RUNNING:
         return
     now = time.time()
-    st = load_state()
+    now_iso = utc_now_iso()  # one timestamp for every record in this pass
+    st = peek_state()
     owner_chat_id = int(st.get("owner_chat_id") or 0)
 
+    # RUNNING meta is built by assign_tasks() with typed fields (float
+    # timestamps, int worker_id/attempt), so read them without re-coercing.
+    first_deadline = min(SOFT_TIMEOUT_SEC, HARD_TIMEOUT_SEC)
     for task_id, meta in list(RUNNING.items()):
-        if not isinstance(meta, dict):
-            continue
-        task = meta.get("task") if isinstance(meta.get("task"), dict) else {}
-        started_at = float(meta.get("started_at") or 0.0)
+        started_at = meta.get("started_at") or 0.0
         if started_at <= 0:
             continue
-        last_hb = float(meta.get("last_heartbeat_at") or started_at)
-        runtime_sec = max(0.0, now - started_at)
-        hb_lag_sec = max(0.0, now - last_hb)
+        runtime_sec = now - started_at
+        if runtime_sec < first_deadline:
+            continue  # common case: nothing to do for this task
+        task = meta.get("task") or {}
+        hb_lag_sec = max(0.0, now - (meta.get("last_heartbeat_at") or started_at))
         hb_stale = hb_lag_sec >= HEARTBEAT_STALE_SEC
-        _wid = meta.get("worker_id")
-        worker_id = int(_wid) if _wid is not None else -1
-        task_type = str(task.get("type") or "")
-        _att = meta.get("attempt")
-        if _att is None:
-            _att = task.get("_attempt")
-        attempt = int(_att) if _att is not None else 1
-
-        if runtime_sec >= SOFT_TIMEOUT_SEC and not bool(meta.get("soft_sent")):
+        worker_id = meta.get("worker_id", -1)
+        task_type = task.get("type") or ""
+        attempt = meta.get("attempt") or task.get("_attempt") or 1
+
+        if runtime_sec >= SOFT_TIMEOUT_SEC and not meta.get("soft_sent"):
             meta["soft_sent"] = True
             if owner_chat_id:
                 send_with_budget(
@@ -293,9 +551,7 @@ def enforce_task_timeouts() -> None:
         if worker_id in workers.WORKERS:
             w = workers.WORKERS[worker_id]
             try:
-                if w.proc.is_alive():
-                    w.proc.terminate()
-                w.proc.join(timeout=5)
+                workers.terminate_later(w.proc, grace_sec=5.0)
             except Exception:
                 log.warning("Failed to terminate worker %d during hard timeout", worker_id, exc_info=True)
                 pass
@@ -306,10 +562,10 @@ def enforce_task_timeouts() -> None:
         if attempt <= QUEUE_MAX_RETRIES and isinstance(task, dict):
             retried = dict(task)
             retried["original_task_id"] = task_id
-            retried["id"] = uuid.uuid4().hex[:8]
+            retried["id"] = new_task_id()
             retried["_attempt"] = attempt + 1
             retried["timeout_retry_from"] = task_id
-            retried["timeout_retry_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+            retried["timeout_retry_at"] = now_iso
             enqueue_task(retried, front=True)
             requeued = True
             new_attempt = attempt + 1
@@ -317,7 +573,7 @@ def enforce_task_timeouts() -> None:
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": now_iso,
                 "type": "task_hard_timeout",
                 "task_id": task_id, "task_type": task_type,
                 "worker_id": worker_id, "runtime_sec": round(runtime_sec, 2),
@@ -339,7 +595,7 @@ def enforce_task_timeouts() -> None:
                     f"Worker {worker_id} restarted. Retry limit exhausted, task stopped."
                 ))
 
-        persist_queue_snapshot(reason="task_hard_timeout")
+        mark_snapshot_dirty(reason="task_hard_timeout")
 
 
 # ---------------------------------------------------------------------------
@@ -358,19 +614,19 @@ def build_review_task_text(reason: str) -> str:
 
 def queue_review_task(reason: str, force: bool = False) -> Optional[str]:
     """Queue a review task."""
-    st = load_state()
+    st = peek_state()
     owner_chat_id = st.get("owner_chat_id")
     if not owner_chat_id:
         return None
     if (not force) and queue_has_task_type("review"):
         return None
-    tid = uuid.uuid4().hex[:8]
+    tid = new_task_id()
     enqueue_task({
         "id": tid, "type": "review",
         "chat_id": int(owner_chat_id),
         "text": build_review_task_text(reason=reason),
     })
-    persist_queue_snapshot(reason="review_enqueued")
+    mark_snapshot_dirty(reason="review_enqueued")
     send_with_budget(int(owner_chat_id), f"🔎 Review queued: {tid} ({reason})")
     return tid
 
@@ -383,9 +639,12 @@ def enqueue_evolution_task_if_needed() -> None:
     """
     if PENDING or RUNNING:
         return
-    st = load_state()
-    if not bool(st.get("evolution_mode_enabled")):
+    # Called every idle tick: gate on a read-only peek, take the copying load
+    # only once an evolution task is actually due.
+    peek = peek_state()
+    if not bool(peek.get("evolution_mode_enabled")) or not peek.get("owner_chat_id"):
         return
+    st = load_state()
     owner_chat_id = st.get("owner_chat_id")
     if not owner_chat_id:
         return
@@ -409,13 +668,13 @@ def enqueue_evolution_task_if_needed() -> None:
         send_with_budget(int(owner_chat_id), f"💸 Evolution stopped: ${remaining:.2f} remaining (reserve ${EVOLUTION_BUDGET_RESERVE:.0f} for conversations).")
         return
     cycle = int(st.get("evolution_cycle") or 0) + 1
-    tid = uuid.uuid4().hex[:8]
+    tid = new_task_id()
     enqueue_task({
         "id": tid, "type": "evolution",
         "chat_id": int(owner_chat_id),
         "text": build_evolution_task_text(cycle),
     })
     st["evolution_cycle"] = cycle
-    st["last_evolution_task_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    st["last_evolution_task_at"] = utc_now_iso()
     save_state(st)
     send_with_budget(int(owner_chat_id), f"🧬 Evolution #{cycle}: {tid}")
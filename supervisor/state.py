@@ -6,14 +6,26 @@ Persistent state on Google Drive: load, save, atomic writes, file locks.
 
 from __future__ import annotations
 
+import atexit
 import datetime
+import itertools
 import json
 import logging
 import os
 import pathlib
+import shutil
+import threading
 import time
+import types
 import uuid
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: O_EXCL lock files only
+    fcntl = None  # type: ignore[assignment]
+
+from ouroboros.utils import json_dumps, json_loads, utc_now_iso
 
 log = logging.getLogger(__name__)
 
@@ -30,6 +42,8 @@ QUEUE_SNAPSHOT_PATH: pathlib.Path = DRIVE_ROOT / "state" / "queue_snapshot.json"
 
 def init(drive_root: pathlib.Path, total_budget_limit: float = 0.0) -> None:
     global DRIVE_ROOT, STATE_PATH, STATE_LAST_GOOD_PATH, STATE_LOCK_PATH, QUEUE_SNAPSHOT_PATH
+    global _STATE_CACHE
+    _STATE_CACHE = None
     DRIVE_ROOT = drive_root
     STATE_PATH = drive_root / "state" / "state.json"
     STATE_LAST_GOOD_PATH = drive_root / "state" / "state.last_good.json"
@@ -42,25 +56,55 @@ def init(drive_root: pathlib.Path, total_budget_limit: float = 0.0) -> None:
 # Atomic file operations
 # ---------------------------------------------------------------------------
 
-def atomic_write_text(path: pathlib.Path, content: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_name(f".{path.name}.tmp.{uuid.uuid4().hex}")
-    fd = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+_KNOWN_DIRS: Set[str] = set()
+_fdatasync = getattr(os, "fdatasync", os.fsync)  # fdatasync is Linux-only
+
+
+def atomic_write_text(path: pathlib.Path, content: str, durable: bool = True) -> None:
+    """Write via tmp file + os.replace.
+
+    durable=True syncs file data (fdatasync) before the rename; pass False for
+    snapshots/diagnostics that are cheap to lose, skipping the sync entirely —
+    syncs are very expensive on Drive FUSE.
+
+    The tmp name is unique per (process, thread) rather than random, so there
+    is no urandom read per write and a writer that died mid-write leaves at
+    most one stale tmp file, overwritten on its next write.
+    """
+    parent = str(path.parent)
+    if parent not in _KNOWN_DIRS:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _KNOWN_DIRS.add(parent)
+    data = content.encode("utf-8")
+    tmp = path.with_name(f".{path.name}.tmp.{os.getpid()}.{threading.get_ident()}")
     try:
-        data = content.encode("utf-8")
-        os.write(fd, data)
-        os.fsync(fd)
-    finally:
-        os.close(fd)
-    os.replace(str(tmp), str(path))
+        fd = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    except FileNotFoundError:
+        # Directory removed behind our back: recreate and retry once.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        try:
+            os.write(fd, data)
+            if durable:
+                _fdatasync(fd)
+        finally:
+            os.close(fd)
+        os.replace(str(tmp), str(path))
+    except BaseException:
+        try:
+            os.unlink(str(tmp))
+        except OSError:
+            pass
+        raise
 
 
 def json_load_file(path: pathlib.Path) -> Optional[Dict[str, Any]]:
     try:
-        if not path.exists():
-            return None
-        obj = json.loads(path.read_text(encoding="utf-8"))
+        obj = json_loads(path.read_bytes())
         return obj if isinstance(obj, dict) else None
+    except FileNotFoundError:
+        return None
     except Exception:
         log.debug(f"Failed to load JSON from {path}", exc_info=True)
         return None
@@ -70,15 +114,57 @@ def json_load_file(path: pathlib.Path) -> Optional[Dict[str, Any]]:
 # File locks
 # ---------------------------------------------------------------------------
 
+# Lock fds held via flock (as opposed to the O_EXCL lock-file fallback).
+_FLOCK_FDS: Set[int] = set()
+_FLOCK_BACKOFF_SEC = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1)
+
+
+def _acquire_flock(lock_path: pathlib.Path, timeout_sec: float) -> Tuple[Optional[int], bool]:
+    """Try fcntl.flock on lock_path. Returns (fd, supported).
+
+    The fd is opened per acquisition (never shared across fork, since flock
+    locks belong to the open file description) and the lock is dropped by the
+    kernel if the holder dies, so no stale-lock handling is needed.
+    """
+    if fcntl is None:
+        return None, False
+    try:
+        fd = os.open(str(lock_path), os.O_CREAT | os.O_RDWR, 0o644)
+    except OSError:
+        return None, False
+    started = time.time()
+    attempt = 0
+    while True:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            _FLOCK_FDS.add(fd)
+            return fd, True
+        except BlockingIOError:
+            if (time.time() - started) >= timeout_sec:
+                os.close(fd)
+                return None, True
+            time.sleep(_FLOCK_BACKOFF_SEC[min(attempt, len(_FLOCK_BACKOFF_SEC) - 1)])
+            attempt += 1
+        except OSError:
+            # Filesystem without flock support (some FUSE mounts): fall back.
+            os.close(fd)
+            return None, False
+
+
 def acquire_file_lock(lock_path: pathlib.Path, timeout_sec: float = 4.0,
                       stale_sec: float = 90.0) -> Optional[int]:
     lock_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, supported = _acquire_flock(lock_path, timeout_sec)
+    if supported:
+        if fd is None:
+            log.warning(f"Timed out acquiring lock at {lock_path}")
+        return fd
     started = time.time()
     while (time.time() - started) < timeout_sec:
         try:
             fd = os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
             try:
-                os.write(fd, f"pid={os.getpid()} ts={datetime.datetime.now(datetime.timezone.utc).isoformat()}\n".encode("utf-8"))
+                os.write(fd, f"pid={os.getpid()} ts={utc_now_iso()}\n".encode("utf-8"))
             except Exception:
                 log.debug(f"Failed to write lock metadata to {lock_path}", exc_info=True)
                 pass
@@ -102,6 +188,15 @@ def acquire_file_lock(lock_path: pathlib.Path, timeout_sec: float = 4.0,
 def release_file_lock(lock_path: pathlib.Path, lock_fd: Optional[int]) -> None:
     if lock_fd is None:
         return
+    if lock_fd in _FLOCK_FDS:
+        # Closing the fd drops the flock; the lock file itself stays in place
+        # (unlinking it would let a waiter lock an orphaned inode).
+        _FLOCK_FDS.discard(lock_fd)
+        try:
+            os.close(lock_fd)
+        except Exception:
+            log.debug(f"Failed to close lock fd {lock_fd} for {lock_path}", exc_info=True)
+        return
     try:
         os.close(lock_fd)
     except Exception:
@@ -123,32 +218,49 @@ from ouroboros.utils import append_jsonl  # noqa: F401
 # State schema
 # ---------------------------------------------------------------------------
 
+# Static defaults; created_at/session_id are generated per state.
+_STATE_DEFAULTS: Mapping[str, Any] = types.MappingProxyType({
+    "owner_id": None,
+    "owner_chat_id": None,
+    "tg_offset": 0,
+    "spent_usd": 0.0,
+    "spent_calls": 0,
+    "spent_tokens_prompt": 0,
+    "spent_tokens_completion": 0,
+    "spent_tokens_cached": 0,
+    "current_branch": None,
+    "current_sha": None,
+    "last_owner_message_at": "",
+    "last_evolution_task_at": "",
+    "budget_messages_since_report": 0,
+    "evolution_mode_enabled": False,
+    "evolution_cycle": 0,
+    "session_total_snapshot": None,
+    "session_spent_snapshot": None,
+    "budget_drift_pct": None,
+    "budget_drift_alert": False,
+    "evolution_consecutive_failures": 0,
+})
+_STATE_REQUIRED_KEYS = frozenset(_STATE_DEFAULTS) | {"created_at", "session_id"}
+_STATE_LEGACY_KEYS = frozenset({
+    "approvals", "idle_cursor", "idle_stats", "last_idle_task_at",
+    "last_auto_review_at", "last_review_task_id", "session_daily_snapshot",
+})
+
+
 def ensure_state_defaults(st: Dict[str, Any]) -> Dict[str, Any]:
-    st.setdefault("created_at", datetime.datetime.now(datetime.timezone.utc).isoformat())
-    st.setdefault("owner_id", None)
-    st.setdefault("owner_chat_id", None)
-    st.setdefault("tg_offset", 0)
-    st.setdefault("spent_usd", 0.0)
-    st.setdefault("spent_calls", 0)
-    st.setdefault("spent_tokens_prompt", 0)
-    st.setdefault("spent_tokens_completion", 0)
-    st.setdefault("spent_tokens_cached", 0)
-    st.setdefault("session_id", uuid.uuid4().hex)
-    st.setdefault("current_branch", None)
-    st.setdefault("current_sha", None)
-    st.setdefault("last_owner_message_at", "")
-    st.setdefault("last_evolution_task_at", "")
-    st.setdefault("budget_messages_since_report", 0)
-    st.setdefault("evolution_mode_enabled", False)
-    st.setdefault("evolution_cycle", 0)
-    st.setdefault("session_total_snapshot", None)
-    st.setdefault("session_spent_snapshot", None)
-    st.setdefault("budget_drift_pct", None)
-    st.setdefault("budget_drift_alert", False)
-    st.setdefault("evolution_consecutive_failures", 0)
-    for legacy_key in ("approvals", "idle_cursor", "idle_stats", "last_idle_task_at",
-                        "last_auto_review_at", "last_review_task_id", "session_daily_snapshot"):
-        st.pop(legacy_key, None)
+    # Fast path: already-normalized state (the common case) needs no changes.
+    if st.keys() >= _STATE_REQUIRED_KEYS and _STATE_LEGACY_KEYS.isdisjoint(st):
+        return st
+    if "created_at" not in st:
+        st["created_at"] = utc_now_iso()
+    if "session_id" not in st:
+        st["session_id"] = uuid.uuid4().hex
+    for key, value in _STATE_DEFAULTS.items():
+        if key not in st:
+            st[key] = value
+    for legacy_key in _STATE_LEGACY_KEYS.intersection(st):
+        del st[legacy_key]
     return st
 
 
@@ -161,8 +273,108 @@ def default_state_dict() -> Dict[str, Any]:
 # Load / Save
 # ---------------------------------------------------------------------------
 
+# In-process snapshot of the last state read or written, keyed by the state
+# file's (inode, mtime_ns, size). atomic_write_text() always swaps in a new
+# inode, so a save from any process invalidates the snapshot.
+_STATE_CACHE: Optional[Tuple[Tuple[int, int, int], Dict[str, Any]]] = None
+
+
+def _state_file_sig() -> Optional[Tuple[int, int, int]]:
+    try:
+        s = os.stat(STATE_PATH)
+    except OSError:
+        return None
+    return s.st_ino, s.st_mtime_ns, s.st_size
+
+
+def _copy_json(obj: Any) -> Any:
+    """Deep copy for JSON-shaped data (dict/list/scalars); much cheaper than copy.deepcopy."""
+    if isinstance(obj, dict):
+        return {k: _copy_json(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_copy_json(v) for v in obj]
+    return obj
+
+
+def _cached_state(sig: Optional[Tuple[int, int, int]]) -> Optional[Dict[str, Any]]:
+    """Return a private copy of the cached state if it matches the file signature."""
+    cache = _STATE_CACHE
+    if sig is None or cache is None or cache[0] != sig:
+        return None
+    return _copy_json(cache[1])
+
+
+def _remember_state(sig: Optional[Tuple[int, int, int]], st: Dict[str, Any]) -> None:
+    global _STATE_CACHE
+    _STATE_CACHE = (sig, _copy_json(st)) if sig is not None else None
+
+
+# ---------------------------------------------------------------------------
+# Deferred field updates
+# ---------------------------------------------------------------------------
+# High-frequency, supervisor-owned fields (tg_offset, last_owner_message_at)
+# are recorded here instead of rewriting state.json per message/tick. They
+# are overlaid on every load, folded into any save_state(), and written by
+# flush_state_if_needed() at most once per STATE_FLUSH_INTERVAL_SEC. Only the
+# named keys are merged, so writes from other processes are never clobbered.
+
+STATE_FLUSH_INTERVAL_SEC: float = 1.0
+_PENDING_UPDATES: Dict[str, Any] = {}
+_pending_lock = threading.Lock()
+_LAST_STATE_FLUSH: float = 0.0
+
+
+def update_state_deferred(**fields: Any) -> None:
+    """Record field updates to be persisted by the next flush or save_state()."""
+    with _pending_lock:
+        _PENDING_UPDATES.update(fields)
+
+
+def _apply_pending(st: Dict[str, Any]) -> Dict[str, Any]:
+    if _PENDING_UPDATES:
+        with _pending_lock:
+            st.update(_PENDING_UPDATES)
+    return st
+
+
+def flush_state_if_needed(force: bool = False) -> bool:
+    """Persist deferred field updates if any are pending and the interval has passed."""
+    global _LAST_STATE_FLUSH
+    if not _PENDING_UPDATES:
+        return False
+    now = time.time()
+    if not force and (now - _LAST_STATE_FLUSH) < STATE_FLUSH_INTERVAL_SEC:
+        return False
+    lock_fd = acquire_file_lock(STATE_LOCK_PATH)
+    try:
+        _save_state_unlocked(_load_state_unlocked())
+    finally:
+        release_file_lock(STATE_LOCK_PATH, lock_fd)
+    _LAST_STATE_FLUSH = now
+    return True
+
+
+def _flush_state_at_exit() -> None:
+    try:
+        flush_state_if_needed(force=True)
+    except Exception:
+        log.warning("Failed to flush deferred state updates at exit", exc_info=True)
+
+
+atexit.register(_flush_state_at_exit)
+
+
 def _load_state_unlocked() -> Dict[str, Any]:
     """Load state without acquiring lock. Caller must hold STATE_LOCK."""
+    return _apply_pending(_read_state_unlocked())
+
+
+def _read_state_unlocked() -> Dict[str, Any]:
+    sig = _state_file_sig()
+    cached = _cached_state(sig)
+    if cached is not None:
+        return cached
+
     recovered = False
     st_obj = json_load_file(STATE_PATH)
     if st_obj is None:
@@ -177,18 +389,48 @@ def _load_state_unlocked() -> Dict[str, Any]:
     st = ensure_state_defaults(st_obj)
     if recovered:
         _save_state_unlocked(st)
+    else:
+        _remember_state(sig, st)
     return st
 
 
+def _on_disk_state_unlocked() -> Mapping[str, Any]:
+    """Last persisted state, without the pending overlay. Caller must hold STATE_LOCK."""
+    cache = _STATE_CACHE
+    if cache is not None and cache[0] == _state_file_sig():
+        return cache[1]
+    return json_load_file(STATE_PATH) or {}
+
+
 def _save_state_unlocked(st: Dict[str, Any]) -> None:
     """Save state without acquiring lock. Caller must hold STATE_LOCK."""
+    with _pending_lock:
+        pending = dict(_PENDING_UPDATES)
+    if pending:
+        # Deferred updates are newer than whatever the caller loaded, unless the
+        # caller set the field itself (e.g. acking tg_offset past a /restart).
+        on_disk = _on_disk_state_unlocked()
+        for key, value in pending.items():
+            if key in st and st[key] != value and st[key] != on_disk.get(key):
+                continue
+            st[key] = value
     st = ensure_state_defaults(st)
-    payload = json.dumps(st, ensure_ascii=False, indent=2)
+    payload = json_dumps(st, indent=True)
     atomic_write_text(STATE_PATH, payload)
     atomic_write_text(STATE_LAST_GOOD_PATH, payload)
+    _remember_state(_state_file_sig(), st)
+    if pending:
+        with _pending_lock:
+            for key, value in pending.items():
+                if _PENDING_UPDATES.get(key) is value:
+                    del _PENDING_UPDATES[key]
 
 
 def load_state() -> Dict[str, Any]:
+    # Fast path: state file unchanged since we last read/wrote it — no lock, no parse.
+    cached = _cached_state(_state_file_sig())
+    if cached is not None:
+        return _apply_pending(cached)
     lock_fd = acquire_file_lock(STATE_LOCK_PATH)
     try:
         return _load_state_unlocked()
@@ -196,6 +438,20 @@ def load_state() -> Dict[str, Any]:
         release_file_lock(STATE_LOCK_PATH, lock_fd)
 
 
+def peek_state() -> Mapping[str, Any]:
+    """Read-only view of the current state for hot paths that only read fields.
+
+    Skips the defensive deep copy load_state() makes when the cached snapshot
+    is current. Never mutate the result; use load_state() + save_state().
+    """
+    cache = _STATE_CACHE
+    if cache is not None and cache[0] == _state_file_sig():
+        if _PENDING_UPDATES:
+            return types.MappingProxyType(_apply_pending(dict(cache[1])))
+        return types.MappingProxyType(cache[1])
+    return load_state()
+
+
 def save_state(st: Dict[str, Any]) -> None:
     lock_fd = acquire_file_lock(STATE_LOCK_PATH)
     try:
@@ -224,7 +480,7 @@ def init_state() -> Dict[str, Any]:
             st["session_total_snapshot"] = ground_truth["total_usd"]
             st["openrouter_total_usd"] = ground_truth["total_usd"]
             st["openrouter_daily_usd"] = ground_truth["daily_usd"]
-            st["openrouter_last_check_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+            st["openrouter_last_check_at"] = utc_now_iso()
         else:
             # If we can't fetch ground truth, use 0 as baseline
             st["session_total_snapshot"] = 0.0
@@ -279,7 +535,7 @@ def check_openrouter_ground_truth() -> Optional[Dict[str, float]]:
             headers={"Authorization": f"Bearer {api_key}"},
         )
         with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+            data = json_loads(resp.read())
         # OpenRouter API returns usage already in dollars (not cents)
         usage_total = data.get("data", {}).get("usage", 0)
         usage_daily = data.get("data", {}).get("usage_daily", 0)
@@ -353,7 +609,7 @@ def update_budget_from_usage(usage: Dict[str, Any]) -> None:
                 st = _load_state_unlocked()
                 st["openrouter_total_usd"] = ground_truth["total_usd"]
                 st["openrouter_daily_usd"] = ground_truth["daily_usd"]
-                st["openrouter_last_check_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+                st["openrouter_last_check_at"] = utc_now_iso()
 
                 session_total_snap = st.get("session_total_snapshot")
                 session_spent_snap = st.get("session_spent_snapshot")
@@ -373,7 +629,7 @@ def update_budget_from_usage(usage: Dict[str, Any]) -> None:
                             append_jsonl(
                                 DRIVE_ROOT / "logs" / "events.jsonl",
                                 {
-                                    "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                                    "ts": utc_now_iso(),
                                     "event": "budget_drift_warning",
                                     "drift_pct": round(drift_pct, 2),
                                     "our_delta": round(our_delta, 4),
@@ -417,7 +673,7 @@ def budget_breakdown(st: Dict[str, Any]) -> Dict[str, float]:
                 if not line:
                     continue
                 try:
-                    event = json.loads(line)
+                    event = json_loads(line)
                     if event.get("type") != "llm_usage":
                         continue
 
@@ -464,7 +720,7 @@ def model_breakdown(st: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
                 if not line:
                     continue
                 try:
-                    event = json.loads(line)
+                    event = json_loads(line)
                     if event.get("type") != "llm_usage":
                         continue
 
@@ -526,7 +782,7 @@ def per_task_cost_summary(max_tasks: int = 10, tail_bytes: int = 512_000) -> Lis
                 if not line:
                     continue
                 try:
-                    event = json.loads(line)
+                    event = json_loads(line)
                     if event.get("type") != "llm_usage":
                         continue
                     tid = event.get("task_id") or "unknown"
@@ -551,31 +807,30 @@ def per_task_cost_summary(max_tasks: int = 10, tail_bytes: int = 512_000) -> Lis
 def status_text(workers_dict: Dict[int, Any], pending_list: list, running_dict: Dict[str, Dict[str, Any]],
                 soft_timeout_sec: int, hard_timeout_sec: int) -> str:
     """Build status text from worker and queue state."""
-    st = load_state()
+    st = peek_state()
     now = time.time()
     lines = []
     lines.append(f"owner_id: {st.get('owner_id')}")
     lines.append(f"session_id: {st.get('session_id')}")
     lines.append(f"version: {st.get('current_branch')}@{(st.get('current_sha') or '')[:8]}")
-    busy_count = sum(1 for w in workers_dict.values() if getattr(w, 'busy_task_id', None) is not None)
+    # One pass over workers feeds both the busy count and the busy list
+    busy = [f"{getattr(w, 'wid', '?')}:{w.busy_task_id}"
+            for w in workers_dict.values() if getattr(w, 'busy_task_id', None) is not None]
+    busy_count = len(busy)
     lines.append(f"workers: {len(workers_dict)} (busy: {busy_count})")
     lines.append(f"pending: {len(pending_list)}")
     lines.append(f"running: {len(running_dict)}")
     if pending_list:
-        preview = []
-        for t in pending_list[:10]:
-            preview.append(
-                f"{t.get('id')}:{t.get('type')}:pr{t.get('priority')}:a{int(t.get('_attempt') or 1)}")
-        lines.append("pending_queue: " + ", ".join(preview))
+        lines.append("pending_queue: " + ", ".join(
+            f"{t.get('id')}:{t.get('type')}:pr{t.get('priority')}:a{int(t.get('_attempt') or 1)}"
+            for t in pending_list[:10]))
     if running_dict:
-        lines.append("running_ids: " + ", ".join(list(running_dict.keys())[:10]))
-    busy = [f"{getattr(w, 'wid', '?')}:{getattr(w, 'busy_task_id', '?')}"
-            for w in workers_dict.values() if getattr(w, 'busy_task_id', None)]
+        lines.append("running_ids: " + ", ".join(itertools.islice(running_dict, 10)))
     if busy:
         lines.append("busy: " + ", ".join(busy))
     if running_dict:
         details = []
-        for task_id, meta in list(running_dict.items())[:10]:
+        for task_id, meta in itertools.islice(running_dict.items(), 10):
             task = meta.get("task") if isinstance(meta, dict) else {}
             started = float(meta.get("started_at") or 0.0) if isinstance(meta, dict) else 0.0
             hb = float(meta.get("last_heartbeat_at") or 0.0) if isinstance(meta, dict) else 0.0
@@ -649,15 +904,45 @@ def status_text(workers_dict: Dict[int, Any], pending_list: list, running_dict:
     return "\n".join(lines)
 
 
+# chat.jsonl size as last seen by this process (None = not stat'ed yet).
+# log_chat() adds what it appends, so the per-tick rotation check only
+# touches the filesystem near the limit or every CHAT_LOG_RESTAT_SEC.
+CHAT_LOG_RESTAT_SEC = 60.0
+_CHAT_LOG_APPROX_BYTES: Optional[int] = None
+_CHAT_LOG_LAST_STAT: float = 0.0
+
+
+def note_chat_log_append(nbytes: int) -> None:
+    """Account for bytes this process appended to chat.jsonl."""
+    global _CHAT_LOG_APPROX_BYTES
+    if _CHAT_LOG_APPROX_BYTES is not None:
+        _CHAT_LOG_APPROX_BYTES += int(nbytes)
+
+
 def rotate_chat_log_if_needed(drive_root: pathlib.Path, max_bytes: int = 800_000) -> None:
     """Rotate chat log if it exceeds max_bytes."""
+    global _CHAT_LOG_APPROX_BYTES, _CHAT_LOG_LAST_STAT
+    now = time.monotonic()
+    if (_CHAT_LOG_APPROX_BYTES is not None and _CHAT_LOG_APPROX_BYTES < max_bytes
+            and now - _CHAT_LOG_LAST_STAT < CHAT_LOG_RESTAT_SEC):
+        return
     chat = drive_root / "logs" / "chat.jsonl"
-    if not chat.exists():
+    _CHAT_LOG_LAST_STAT = now
+    try:
+        _CHAT_LOG_APPROX_BYTES = chat.stat().st_size
+    except FileNotFoundError:
+        _CHAT_LOG_APPROX_BYTES = 0
         return
-    if chat.stat().st_size < max_bytes:
+    if _CHAT_LOG_APPROX_BYTES < max_bytes:
         return
     ts = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d_%H%M%S")
     archive_path = drive_root / "archive" / f"chat_{ts}.jsonl"
     archive_path.parent.mkdir(parents=True, exist_ok=True)
-    archive_path.write_bytes(chat.read_bytes())
-    chat.write_text("", encoding="utf-8")
+    # Rename instead of copying: appenders reopen chat.jsonl by path on every
+    # write, so nothing is lost between the move and the recreate below.
+    try:
+        os.replace(chat, archive_path)
+    except OSError:
+        shutil.move(str(chat), str(archive_path))  # e.g. archive on another mount
+    chat.touch()
+    _CHAT_LOG_APPROX_BYTES = 0
@@ -6,14 +6,17 @@ TelegramClient, message splitting, markdown→HTML conversion, send_with_budget.
 
 from __future__ import annotations
 
-import datetime
+import atexit
 import logging
+import queue
 import re
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
-import requests
-
-from supervisor.state import load_state, save_state, append_jsonl
+from ouroboros.utils import append_jsonl_deferred, json_loads, make_http_session, utc_now_iso
+from supervisor.state import (
+    load_state, note_chat_log_append, peek_state, update_state_deferred, append_jsonl,
+)
 
 log = logging.getLogger(__name__)
 
@@ -49,54 +52,49 @@ class TelegramClient:
     def __init__(self, token: str):
         self.base = f"https://api.telegram.org/bot{token}"
         self._token = token
+        # Persistent session: keep-alive, connection pooling and adapter-level
+        # retry/backoff (honours Telegram's Retry-After on 429) for all Bot API calls
+        self._session = make_http_session()
+        # getUpdates long-polls on its own connection so a pending poll never
+        # shares a pooled socket with sends (and can run from another thread).
+        self._poll_session = make_http_session()
 
     def get_updates(self, offset: int, timeout: int = 10) -> List[Dict[str, Any]]:
-        last_err = "unknown"
-        for attempt in range(3):
-            try:
-                r = requests.get(
-                    f"{self.base}/getUpdates",
-                    params={"offset": offset, "timeout": timeout,
-                            "allowed_updates": ["message", "edited_message"]},
-                    timeout=timeout + 5,
-                )
-                r.raise_for_status()
-                data = r.json()
-                if data.get("ok") is not True:
-                    raise RuntimeError(f"Telegram getUpdates failed: {data}")
-                return data.get("result") or []
-            except Exception as e:
-                last_err = repr(e)
-                if attempt < 2:
-                    import time
-                    time.sleep(0.8 * (attempt + 1))
-        raise RuntimeError(f"Telegram getUpdates failed after retries: {last_err}")
+        # Transport errors and 429/5xx are retried (with backoff) by the session adapter.
+        try:
+            r = self._poll_session.get(
+                f"{self.base}/getUpdates",
+                params={"offset": offset, "timeout": timeout,
+                        "allowed_updates": ["message", "edited_message"]},
+                timeout=timeout + 5,
+            )
+            r.raise_for_status()
+            data = json_loads(r.content)
+        except Exception as e:
+            raise RuntimeError(f"Telegram getUpdates failed after retries: {e!r}") from e
+        if data.get("ok") is not True:
+            raise RuntimeError(f"Telegram getUpdates failed: {data}")
+        return data.get("result") or []
 
     def send_message(self, chat_id: int, text: str, parse_mode: str = "") -> Tuple[bool, str]:
-        last_err = "unknown"
-        for attempt in range(3):
-            try:
-                payload: Dict[str, Any] = {"chat_id": chat_id, "text": text,
-                                           "disable_web_page_preview": True}
-                if parse_mode:
-                    payload["parse_mode"] = parse_mode
-                r = requests.post(f"{self.base}/sendMessage", data=payload, timeout=30)
-                r.raise_for_status()
-                data = r.json()
-                if data.get("ok") is True:
-                    return True, "ok"
-                last_err = f"telegram_api_error: {data}"
-            except Exception as e:
-                last_err = repr(e)
-            if attempt < 2:
-                import time
-                time.sleep(0.8 * (attempt + 1))
-        return False, last_err
+        payload: Dict[str, Any] = {"chat_id": chat_id, "text": text,
+                                   "disable_web_page_preview": True}
+        if parse_mode:
+            payload["parse_mode"] = parse_mode
+        try:
+            r = self._session.post(f"{self.base}/sendMessage", data=payload, timeout=30)
+            r.raise_for_status()
+            data = json_loads(r.content)
+        except Exception as e:
+            return False, repr(e)
+        if data.get("ok") is True:
+            return True, "ok"
+        return False, f"telegram_api_error: {data}"
 
     def send_chat_action(self, chat_id: int, action: str = "typing") -> bool:
         """Send chat action (typing indicator). Best-effort, no retries."""
         try:
-            r = requests.post(
+            r = self._session.post(
                 f"{self.base}/sendChatAction",
                 data={"chat_id": chat_id, "action": action},
                 timeout=5,
@@ -109,36 +107,30 @@ class TelegramClient:
     def send_photo(self, chat_id: int, photo_bytes: bytes,
                    caption: str = "") -> Tuple[bool, str]:
         """Send a photo to a chat. photo_bytes is raw PNG/JPEG data."""
-        last_err = "unknown"
-        for attempt in range(3):
-            try:
-                files = {"photo": ("screenshot.png", photo_bytes, "image/png")}
-                data: Dict[str, Any] = {"chat_id": chat_id}
-                if caption:
-                    data["caption"] = caption[:1024]
-                r = requests.post(
-                    f"{self.base}/sendPhoto",
-                    data=data, files=files, timeout=30,
-                )
-                r.raise_for_status()
-                resp = r.json()
-                if resp.get("ok") is True:
-                    return True, "ok"
-                last_err = f"telegram_api_error: {resp}"
-            except Exception as e:
-                last_err = repr(e)
-            if attempt < 2:
-                import time
-                time.sleep(0.8 * (attempt + 1))
-        return False, last_err
+        files = {"photo": ("screenshot.png", photo_bytes, "image/png")}
+        data: Dict[str, Any] = {"chat_id": chat_id}
+        if caption:
+            data["caption"] = caption[:1024]
+        try:
+            r = self._session.post(
+                f"{self.base}/sendPhoto",
+                data=data, files=files, timeout=30,
+            )
+            r.raise_for_status()
+            resp = json_loads(r.content)
+        except Exception as e:
+            return False, repr(e)
+        if resp.get("ok") is True:
+            return True, "ok"
+        return False, f"telegram_api_error: {resp}"
 
     def download_file_base64(self, file_id: str, max_bytes: int = 10_000_000) -> Tuple[Optional[str], str]:
         """Download a file from Telegram and return (base64_data, mime_type). Returns (None, "") on failure."""
         try:
             # Get file path
-            r = requests.get(f"{self.base}/getFile", params={"file_id": file_id}, timeout=10)
+            r = self._session.get(f"{self.base}/getFile", params={"file_id": file_id}, timeout=10)
             r.raise_for_status()
-            data = r.json()
+            data = json_loads(r.content)
             if not data.get("ok"):
                 return None, ""
             file_path = data["result"].get("file_path", "")
@@ -148,7 +140,7 @@ class TelegramClient:
 
             # Download file
             download_url = f"https://api.telegram.org/file/bot{self._token}/{file_path}"
-            r2 = requests.get(download_url, timeout=30)
+            r2 = self._session.get(download_url, timeout=30)
             r2.raise_for_status()
 
             import base64
@@ -166,20 +158,115 @@ class TelegramClient:
             return None, ""
 
 
+# ---------------------------------------------------------------------------
+# Background getUpdates poller
+# ---------------------------------------------------------------------------
+
+class TelegramPoller:
+    """Long-polls getUpdates on a daemon thread and queues each update.
+
+    The supervisor loop drains `updates` without blocking, so a slow or
+    stalled poll never delays worker-event dispatch.
+
+    getUpdates(offset) confirms every update below offset to Telegram, so
+    the poller only polls again once the consumer has ack()ed everything
+    it handed out. Updates still queued at a restart or crash are
+    redelivered (at-least-once), as when the main loop polled directly.
+    """
+
+    def __init__(self, tg: TelegramClient, offset: int, timeout: int = 25,
+                 on_error: Optional[Callable[[Exception, int], None]] = None,
+                 error_backoff_sec: float = 1.5,
+                 on_updates: Optional[Callable[[], None]] = None):
+        self.updates: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self.offset = int(offset)
+        self._acked = int(offset)
+        self._ack_cond = threading.Condition()
+        self._tg = tg
+        self._timeout = int(timeout)
+        self._on_error = on_error
+        self._error_backoff_sec = error_backoff_sec
+        self._on_updates = on_updates
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="tg-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._ack_cond:
+            self._ack_cond.notify_all()
+
+    def ack(self, offset: int) -> None:
+        """Mark updates below offset as handled; the next poll confirms them."""
+        with self._ack_cond:
+            if offset > self._acked:
+                self._acked = int(offset)
+                self._ack_cond.notify_all()
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Return all queued updates without blocking (may be empty)."""
+        out: List[Dict[str, Any]] = []
+        while True:
+            try:
+                out.append(self.updates.get_nowait())
+            except queue.Empty:
+                return out
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._ack_cond:
+                while self._acked < self.offset and not self._stop.is_set():
+                    self._ack_cond.wait(0.5)
+                self.offset = max(self.offset, self._acked)
+            if self._stop.is_set():
+                return
+            try:
+                batch = self._tg.get_updates(offset=self.offset, timeout=self._timeout)
+            except Exception as e:
+                if self._on_error is not None:
+                    try:
+                        self._on_error(e, self.offset)
+                    except Exception:
+                        log.debug("Telegram poll error callback failed", exc_info=True)
+                self._stop.wait(self._error_backoff_sec)
+                continue
+            for upd in batch:
+                try:
+                    self.offset = max(self.offset, int(upd["update_id"]) + 1)
+                except (KeyError, TypeError, ValueError):
+                    continue
+                self.updates.put(upd)
+            if batch and self._on_updates is not None:
+                try:
+                    self._on_updates()
+                except Exception:
+                    log.debug("Telegram updates callback failed", exc_info=True)
+
+
 # ---------------------------------------------------------------------------
 # Message splitting + formatting
 # ---------------------------------------------------------------------------
 
 def split_telegram(text: str, limit: int = 3800) -> List[str]:
+    n = len(text)
+    if n <= limit:
+        return [text]
+    # Walk an offset instead of re-slicing the tail: each char is copied once.
     chunks: List[str] = []
-    s = text
-    while len(s) > limit:
-        cut = s.rfind("\n", 0, limit)
-        if cut < 100:
-            cut = limit
-        chunks.append(s[:cut])
-        s = s[cut:]
-    chunks.append(s)
+    i = 0
+    while n - i > limit:
+        cut = text.rfind("\n", i, i + limit)
+        if cut - i < 100:
+            cut = i + limit
+        chunks.append(text[i:cut])
+        i = cut
+    chunks.append(text[i:])
     return chunks
 
 
@@ -199,27 +286,48 @@ def _tg_utf16_len(text: str) -> int:
     return sum(2 if ord(c) > 0xFFFF else 1 for c in text)
 
 
+# Markdown regexes, compiled once (used on every outgoing message).
+_MD_FENCE_RE = re.compile(r"```[^\n]*\n([\s\S]*?)```", re.MULTILINE)
+_MD_INLINE_CODE_RE = re.compile(r"`([^`]+)`")
+_MD_BOLD_ITALIC_RE = re.compile(r"\*\*\*(.+?)\*\*\*")
+_MD_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+_MD_STAR_ITALIC_RE = re.compile(r"(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)")
+_MD_UNDERSCORE_ITALIC_RE = re.compile(r"(?<!\w)_(.+?)_(?!\w)")
+_MD_STRIKE_RE = re.compile(r"~~(.+?)~~")
+_MD_LINK_RE = re.compile(r"\[([^\]]+)\]\([^)]+\)")
+_MD_HEADER_PREFIX_RE = re.compile(r"^#{1,6}\s+", re.MULTILINE)
+_MD_LIST_RE = re.compile(r"^[\*\-]\s+", re.MULTILINE)
+_HTML_INLINE_CODE_RE = re.compile(r"`([^`\n]+)`")
+_HTML_HEADER_RE = re.compile(r"^#{1,6}\s+(.+)$", re.MULTILINE)
+_HTML_LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+_HTML_BOLD_ITALIC_RE = re.compile(r"\*\*\*([^*\n]+?)\*\*\*")
+_HTML_BOLD_RE = re.compile(r"\*\*([^*\n]+?)\*\*")
+_HTML_STRIKE_RE = re.compile(r"~~([^~\n]+?)~~")
+_HTML_STAR_ITALIC_RE = re.compile(r"(?<![*\w])\*([^*\n]+?)\*(?![*\w])")
+_HTML_UNDERSCORE_ITALIC_RE = re.compile(r"\b_([^_\n]+?)_\b")
+
+
 def _strip_markdown(text: str) -> str:
     """Strip all markdown formatting markers, leaving only plain text."""
     # Fenced code blocks (keep content)
-    text = re.sub(r"```[^\n]*\n([\s\S]*?)```", r"\1", text)
+    text = _MD_FENCE_RE.sub(r"\1", text)
     # Inline code (keep content)
-    text = re.sub(r"`([^`]+)`", r"\1", text)
+    text = _MD_INLINE_CODE_RE.sub(r"\1", text)
     # Bold+italic (***text***)
-    text = re.sub(r"\*\*\*(.+?)\*\*\*", r"\1", text)
+    text = _MD_BOLD_ITALIC_RE.sub(r"\1", text)
     # Bold (**text**)
-    text = re.sub(r"\*\*(.+?)\*\*", r"\1", text)
+    text = _MD_BOLD_RE.sub(r"\1", text)
     # Italic (*text* or _text_)
-    text = re.sub(r"(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)", r"\1", text)
-    text = re.sub(r"(?<!\w)_(.+?)_(?!\w)", r"\1", text)
+    text = _MD_STAR_ITALIC_RE.sub(r"\1", text)
+    text = _MD_UNDERSCORE_ITALIC_RE.sub(r"\1", text)
     # Strikethrough (~~text~~)
-    text = re.sub(r"~~(.+?)~~", r"\1", text)
+    text = _MD_STRIKE_RE.sub(r"\1", text)
     # Links [text](url) -> text
-    text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)
+    text = _MD_LINK_RE.sub(r"\1", text)
     # Headers (# text -> text)
-    text = re.sub(r"^#{1,6}\s+", "", text, flags=re.MULTILINE)
+    text = _MD_HEADER_PREFIX_RE.sub("", text)
     # List markers (- or * at start of line, keep bullet but remove markdown)
-    text = re.sub(r"^[\*\-]\s+", "• ", text, flags=re.MULTILINE)
+    text = _MD_LIST_RE.sub("• ", text)
     # Clean up any remaining stray markdown markers
     text = text.replace("**", "").replace("__", "").replace("~~", "")
     text = text.replace("`", "")
@@ -238,7 +346,7 @@ def _markdown_to_telegram_html(md: str) -> str:
 
     # --- Step 1: extract fenced code blocks into placeholders ---
     # Match ``` with optional language, then content, then closing ```
-    fence_re = re.compile(r"```[^\n]*\n([\s\S]*?)```", re.MULTILINE)
+    fence_re = _MD_FENCE_RE
     fenced: list = []
 
     def _save_fence(m: re.Match) -> str:
@@ -254,7 +362,7 @@ def _markdown_to_telegram_html(md: str) -> str:
     text = fence_re.sub(_save_fence, md)
 
     # --- Step 2: extract inline code into placeholders ---
-    inline_code_re = re.compile(r"`([^`\n]+)`")
+    inline_code_re = _HTML_INLINE_CODE_RE
     inlines: list = []
 
     def _save_inline(m: re.Match) -> str:
@@ -270,7 +378,7 @@ def _markdown_to_telegram_html(md: str) -> str:
 
     # --- Step 4: apply markdown formatting (order matters) ---
     # Headers: # at start of line -> bold with newline
-    text = re.sub(r"^#{1,6}\s+(.+)$", r"<b>\1</b>", text, flags=re.MULTILINE)
+    text = _HTML_HEADER_RE.sub(r"<b>\1</b>", text)
 
     # Links: [text](url) - escape the URL too
     def _replace_link(m: re.Match) -> str:
@@ -280,27 +388,27 @@ def _markdown_to_telegram_html(md: str) -> str:
         url_safe = url.replace('"', '%22').replace('<', '%3C').replace('>', '%3E')
         return f'<a href="{url_safe}">{link_text}</a>'
 
-    text = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", _replace_link, text)
+    text = _HTML_LINK_RE.sub(_replace_link, text)
 
     # Bold+italic: ***text*** (must come before ** and *)
     # Use non-greedy match, handle line breaks
-    text = re.sub(r"\*\*\*([^*\n]+?)\*\*\*", r"<b><i>\1</i></b>", text)
+    text = _HTML_BOLD_ITALIC_RE.sub(r"<b><i>\1</i></b>", text)
 
     # Bold: **text** (non-greedy, single line)
-    text = re.sub(r"\*\*([^*\n]+?)\*\*", r"<b>\1</b>", text)
+    text = _HTML_BOLD_RE.sub(r"<b>\1</b>", text)
 
     # Strikethrough: ~~text~~ (non-greedy, single line)
-    text = re.sub(r"~~([^~\n]+?)~~", r"<s>\1</s>", text)
+    text = _HTML_STRIKE_RE.sub(r"<s>\1</s>", text)
 
     # Italic: *text* (single *, not adjacent to another *, single line)
     # Lookahead/lookbehind to avoid matching ** or *** remnants
-    text = re.sub(r"(?<![*\w])\*([^*\n]+?)\*(?![*\w])", r"<i>\1</i>", text)
+    text = _HTML_STAR_ITALIC_RE.sub(r"<i>\1</i>", text)
 
     # Italic: _text_ (word-boundary to avoid matching snake_case, single line)
-    text = re.sub(r"\b_([^_\n]+?)_\b", r"<i>\1</i>", text)
+    text = _HTML_UNDERSCORE_ITALIC_RE.sub(r"<i>\1</i>", text)
 
     # List items: convert - or * at line start to •
-    text = re.sub(r"^[\*\-]\s+", "• ", text, flags=re.MULTILINE)
+    text = _MD_LIST_RE.sub("• ", text)
 
     # --- Step 5: restore placeholders ---
     for i, code in enumerate(inlines):
@@ -374,7 +482,7 @@ def _send_markdown_telegram(chat_id: int, text: str) -> Tuple[bool, str]:
 # Budget + logging
 # ---------------------------------------------------------------------------
 
-def _format_budget_line(st: Dict[str, Any]) -> str:
+def _format_budget_line(st: Mapping[str, Any]) -> str:
     spent = float(st.get("spent_usd") or 0.0)
     total = float(TOTAL_BUDGET_LIMIT or 0.0)
     pct = (spent / total * 100.0) if total > 0 else 0.0
@@ -383,50 +491,55 @@ def _format_budget_line(st: Dict[str, Any]) -> str:
     return f"—\nBudget: ${spent:.4f} / ${total:.2f} ({pct:.2f}%) | {branch}@{sha}"
 
 
+# Messages sent since the last budget line. Kept in memory (seeded from
+# state once) so sending a message doesn't cost a state.json read+write;
+# each change rides the deferred state flush (also forced by kill_workers()
+# before execv restarts, which skip atexit).
+_budget_msgs_since_report: Optional[int] = None
+_budget_counter_lock = threading.Lock()
+
+
 def budget_line(force: bool = False) -> str:
+    global _budget_msgs_since_report
     try:
-        st = load_state()
         every = max(1, int(BUDGET_REPORT_EVERY_MESSAGES))
-        if force:
-            st["budget_messages_since_report"] = 0
-            save_state(st)
-            return _format_budget_line(st)
-
-        counter = int(st.get("budget_messages_since_report") or 0) + 1
-        if counter < every:
-            st["budget_messages_since_report"] = counter
-            save_state(st)
+        with _budget_counter_lock:
+            if _budget_msgs_since_report is None:
+                _budget_msgs_since_report = int(load_state().get("budget_messages_since_report") or 0)
+            counter = 0 if force else _budget_msgs_since_report + 1
+            if counter >= every:
+                counter = 0
+            _budget_msgs_since_report = counter
+            update_state_deferred(budget_messages_since_report=counter)
+        if counter:
             return ""
-
-        st["budget_messages_since_report"] = 0
-        save_state(st)
-        return _format_budget_line(st)
+        return _format_budget_line(peek_state())
     except Exception:
         log.debug("Suppressed exception in budget_line", exc_info=True)
         return ""
 
 
 def log_chat(direction: str, chat_id: int, user_id: int, text: str) -> None:
-    append_jsonl(DRIVE_ROOT / "logs" / "chat.jsonl", {
-        "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-        "session_id": load_state().get("session_id"),
+    note_chat_log_append(append_jsonl(DRIVE_ROOT / "logs" / "chat.jsonl", {
+        "ts": utc_now_iso(),
+        "session_id": peek_state().get("session_id"),
         "direction": direction,
         "chat_id": chat_id,
         "user_id": user_id,
         "text": text,
-    })
+    }))
 
 
 def send_with_budget(chat_id: int, text: str, log_text: Optional[str] = None,
                      force_budget: bool = False, fmt: str = "",
                      is_progress: bool = False) -> None:
-    st = load_state()
+    st = peek_state()
     owner_id = int(st.get("owner_id") or 0)
     # Progress messages go to progress.jsonl instead of chat.jsonl
     # This keeps chat history clean for context building
     if is_progress:
-        append_jsonl(DRIVE_ROOT / "logs" / "progress.jsonl", {
-            "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        append_jsonl_deferred(DRIVE_ROOT / "logs" / "progress.jsonl", {
+            "ts": utc_now_iso(),
             "direction": "out", "chat_id": chat_id, "user_id": owner_id,
             "text": text if log_text is None else log_text,
         })
@@ -448,10 +561,10 @@ def send_with_budget(chat_id: int, text: str, log_text: Optional[str] = None,
     if fmt == "markdown":
         ok, err = _send_markdown_telegram(chat_id, full)
         if not ok:
-            append_jsonl(
+            append_jsonl_deferred(
                 DRIVE_ROOT / "logs" / "supervisor.jsonl",
                 {
-                    "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    "ts": utc_now_iso(),
                     "type": "telegram_send_error",
                     "chat_id": chat_id,
                     "error": err,
@@ -464,10 +577,10 @@ def send_with_budget(chat_id: int, text: str, log_text: Optional[str] = None,
     for idx, part in enumerate(split_telegram(full)):
         ok, err = tg.send_message(chat_id, part)
         if not ok:
-            append_jsonl(
+            append_jsonl_deferred(
                 DRIVE_ROOT / "logs" / "supervisor.jsonl",
                 {
-                    "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    "ts": utc_now_iso(),
                     "type": "telegram_send_error",
                     "chat_id": chat_id,
                     "part_index": idx,
@@ -475,3 +588,86 @@ def send_with_budget(chat_id: int, text: str, log_text: Optional[str] = None,
                 },
             )
             break
+
+
+# ---------------------------------------------------------------------------
+# Background outbox
+# ---------------------------------------------------------------------------
+# Worker-event notifications are sent from a single sender thread instead of
+# on the supervisor loop, so a slow Telegram API can't hold up heartbeat and
+# result handling. Ordering is FIFO only within the outbox: direct
+# send_with_budget() calls (e.g. command replies) bypass it and can overtake
+# notifications still queued here.
+OUTBOX_MAX = 500
+OUTBOX_JOIN_TIMEOUT_SEC = 30.0
+_outbox: "queue.Queue[Tuple[int, str, Dict[str, Any]]]" = queue.Queue(maxsize=OUTBOX_MAX)
+_outbox_thread: Optional[threading.Thread] = None
+_outbox_lock = threading.Lock()
+_outbox_stop = threading.Event()
+
+
+def _send_outbox_item(chat_id: int, text: str, kwargs: Dict[str, Any]) -> None:
+    try:
+        send_with_budget(chat_id, text, **kwargs)
+    except Exception:
+        log.warning("Outbox send to chat %s failed", chat_id, exc_info=True)
+
+
+def _outbox_loop() -> None:
+    while not _outbox_stop.is_set():
+        try:
+            chat_id, text, kwargs = _outbox.get(timeout=0.5)
+        except queue.Empty:
+            continue
+        try:
+            _send_outbox_item(chat_id, text, kwargs)
+        finally:
+            _outbox.task_done()
+
+
+def send_with_budget_later(chat_id: int, text: str, **kwargs: Any) -> None:
+    """Queue a send_with_budget() call for the background sender thread.
+
+    Falls back to sending inline when the outbox is full (backpressure).
+    """
+    global _outbox_thread
+    if _outbox_thread is None or not _outbox_thread.is_alive():
+        with _outbox_lock:
+            if _outbox_thread is None or not _outbox_thread.is_alive():
+                _outbox_stop.clear()
+                _outbox_thread = threading.Thread(target=_outbox_loop, name="tg-outbox", daemon=True)
+                _outbox_thread.start()
+    try:
+        _outbox.put_nowait((int(chat_id), text, kwargs))
+    except queue.Full:
+        log.warning("Telegram outbox full (%d); sending inline", OUTBOX_MAX)
+        _send_outbox_item(int(chat_id), text, kwargs)
+
+
+def flush_outbox() -> None:
+    """Stop the sender thread, then send everything still queued, in order.
+
+    The sender finishes only its in-flight item before exiting, so nothing
+    is sent concurrently or out of order. The next send_with_budget_later()
+    starts a fresh sender.
+    """
+    with _outbox_lock:
+        _outbox_stop.set()
+        thread = _outbox_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(OUTBOX_JOIN_TIMEOUT_SEC)
+            if thread.is_alive():
+                log.warning("Telegram outbox sender still busy after %.0fs; flushing anyway",
+                            OUTBOX_JOIN_TIMEOUT_SEC)
+        while True:
+            try:
+                chat_id, text, kwargs = _outbox.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                _send_outbox_item(chat_id, text, kwargs)
+            finally:
+                _outbox.task_done()
+
+
+atexit.register(flush_outbox)
@@ -9,21 +9,21 @@ from __future__ import annotations
 import logging
 log = logging.getLogger(__name__)
 
-import datetime
-import json
+import collections
+import itertools
 import multiprocessing as mp
 import os
 import pathlib
 import sys
 import threading
 import time
-import uuid
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
 
-from supervisor.state import load_state, append_jsonl
+from ouroboros.utils import append_jsonl_deferred, flush_jsonl, json_dumps, json_loads, new_task_id, read_tail_lines, utc_now_iso
+from supervisor.state import flush_state_if_needed, load_state, peek_state, append_jsonl
 from supervisor import git_ops
-from supervisor.telegram import send_with_budget
+from supervisor.telegram import flush_outbox, send_with_budget
 
 
 # ---------------------------------------------------------------------------
@@ -104,15 +104,16 @@ def get_event_q():
     return _EVENT_Q
 
 
-WORKERS: Dict[int, Worker] = {}
-PENDING: List[Dict[str, Any]] = []
-RUNNING: Dict[str, Dict[str, Any]] = {}
-CRASH_TS: List[float] = []
-QUEUE_SEQ_COUNTER_REF: Dict[str, int] = {"value": 0}
-
 # Lock for all mutations to PENDING, RUNNING, WORKERS shared collections.
 # Canonical definition lives in queue.py; imported here for use by assign_tasks/kill_workers.
-from supervisor.queue import _queue_lock
+from supervisor.queue import TypeCountedDict, TypeCountedList, _queue_lock
+
+WORKERS: Dict[int, Worker] = {}
+# Type-counting containers: queue_has_task_type() is O(1) instead of a scan.
+PENDING: List[Dict[str, Any]] = TypeCountedList()
+RUNNING: Dict[str, Dict[str, Any]] = TypeCountedDict()
+CRASH_TS: Deque[float] = collections.deque()  # oldest first; trimmed from the left
+QUEUE_SEQ_COUNTER_REF: Dict[str, int] = {"value": 0}
 
 
 def get_running_task_ids() -> List[str]:
@@ -143,7 +144,7 @@ def handle_chat_direct(chat_id: int, text: str, image_data: Optional[Union[Tuple
     try:
         agent = _get_chat_agent()
         task = {
-            "id": uuid.uuid4().hex[:8],
+            "id": new_task_id(),
             "type": "task",
             "chat_id": chat_id,
             "text": text,
@@ -170,7 +171,7 @@ def handle_chat_direct(chat_id: int, text: str, image_data: Optional[Union[Tuple
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": utc_now_iso(),
                 "type": "direct_chat_error",
                 "error": repr(e),
                 "traceback": str(traceback.format_exc())[:2000],
@@ -210,11 +211,10 @@ def auto_resume_after_restart() -> None:
             sup_log = DRIVE_ROOT / "logs" / "supervisor.jsonl"
             if sup_log.exists():
                 try:
-                    lines = sup_log.read_text(encoding="utf-8").strip().split("\n")
-                    for line in reversed(lines[-20:]):
+                    for line in reversed(read_tail_lines(sup_log, 20)):
                         if not line.strip():
                             continue
-                        evt = json.loads(line)
+                        evt = json_loads(line)
                         if evt.get("type") in ("launcher_start", "restart"):
                             recent_restart = True
                             break
@@ -258,13 +258,13 @@ def auto_resume_after_restart() -> None:
             append_jsonl(
                 DRIVE_ROOT / "logs" / "supervisor.jsonl",
                 {
-                    "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    "ts": utc_now_iso(),
                     "type": "auto_resume_triggered",
                 },
             )
     except Exception as e:
         append_jsonl(DRIVE_ROOT / "logs" / "supervisor.jsonl", {
-            "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "ts": utc_now_iso(),
             "type": "auto_resume_error",
             "error": repr(e),
         })
@@ -306,15 +306,15 @@ def _log_worker_crash(wid: int, drive_root: pathlib.Path, phase: str, exc: Excep
     try:
         path = drive_root / "logs" / "supervisor.jsonl"
         path.parent.mkdir(parents=True, exist_ok=True)
-        entry = json.dumps({
-            "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        entry = json_dumps({
+            "ts": utc_now_iso(),
             "type": "worker_crash",
             "worker_id": wid,
             "pid": _os.getpid(),
             "phase": phase,
             "error": repr(exc),
             "traceback": str(tb)[:3000],
-        }, ensure_ascii=False)
+        })
         with path.open("a", encoding="utf-8") as f:
             f.write(entry + "\n")
     except Exception:
@@ -342,7 +342,7 @@ def _first_worker_boot_event_since(offset_bytes: int) -> Optional[Dict[str, Any]
         if not raw:
             continue
         try:
-            evt = json.loads(raw)
+            evt = json_loads(raw)
         except Exception:
             log.debug("Suppressed exception in loop", exc_info=True)
             continue
@@ -359,7 +359,7 @@ def _verify_worker_sha_after_spawn(events_offset: int, timeout_sec: float = 90.0
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": utc_now_iso(),
                 "type": "worker_sha_verify_skipped",
                 "reason": "missing_current_sha",
             },
@@ -378,7 +378,7 @@ def _verify_worker_sha_after_spawn(events_offset: int, timeout_sec: float = 90.0
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": utc_now_iso(),
                 "type": "worker_sha_verify_timeout",
                 "expected_sha": expected_sha,
             },
@@ -390,7 +390,7 @@ def _verify_worker_sha_after_spawn(events_offset: int, timeout_sec: float = 90.0
     append_jsonl(
         DRIVE_ROOT / "logs" / "supervisor.jsonl",
         {
-            "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "ts": utc_now_iso(),
             "type": "worker_sha_verify",
             "ok": ok,
             "expected_sha": expected_sha,
@@ -420,7 +420,7 @@ def spawn_workers(n: int = 0) -> None:
     append_jsonl(
         DRIVE_ROOT / "logs" / "supervisor.jsonl",
         {
-            "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "ts": utc_now_iso(),
             "type": "worker_spawn_start",
             "start_method": _WORKER_START_METHOD,
             "count": count,
@@ -440,23 +440,82 @@ def spawn_workers(n: int = 0) -> None:
     threading.Thread(target=_verify_worker_sha_after_spawn, args=(events_offset,), daemon=True).start()
 
 
+def terminate_processes(procs: List[Any], grace_sec: float) -> None:
+    """SIGTERM every process, join against one shared deadline, SIGKILL stragglers.
+
+    Total wait is bounded by grace_sec regardless of how many workers there are.
+    """
+    for p in procs:
+        if p.is_alive():
+            p.terminate()
+    deadline = time.time() + grace_sec
+    for p in procs:
+        p.join(timeout=max(0.0, deadline - time.time()))
+    for p in procs:
+        if p.is_alive():
+            log.warning("Worker pid=%s ignored SIGTERM; sending SIGKILL", p.pid)
+            p.kill()
+            p.join(timeout=1)
+
+
+# Cancelled / hard-timed-out workers that were sent SIGTERM but not yet
+# collected: (process, SIGKILL deadline). Reaped from the main loop.
+_REAPING: List[Tuple[Any, float]] = []
+_REAPING_LOCK = threading.Lock()
+
+
+def terminate_later(proc: Any, grace_sec: float = 5.0) -> None:
+    """SIGTERM proc now and leave the join/SIGKILL to reap_terminated()."""
+    if proc.is_alive():
+        proc.terminate()
+    with _REAPING_LOCK:
+        _REAPING.append((proc, time.time() + grace_sec))
+
+
+def reap_terminated() -> None:
+    """Join exited processes from terminate_later(); SIGKILL any past their deadline."""
+    with _REAPING_LOCK:
+        if not _REAPING:
+            return
+        entries = _REAPING[:]
+        _REAPING.clear()
+    now = time.time()
+    keep = []
+    for proc, deadline in entries:
+        if proc.is_alive() and now >= deadline:
+            log.warning("Worker pid=%s ignored SIGTERM; sending SIGKILL", proc.pid)
+            proc.kill()
+        proc.join(timeout=0)
+        if proc.is_alive():
+            keep.append((proc, deadline))
+    if keep:
+        with _REAPING_LOCK:
+            _REAPING.extend(keep)
+
+
+def _drain_reaping() -> List[Any]:
+    with _REAPING_LOCK:
+        procs = [p for p, _ in _REAPING]
+        _REAPING.clear()
+    return procs
+
+
 def kill_workers() -> None:
     from supervisor import queue
     with _queue_lock:
         cleared_running = len(RUNNING)
-        for w in WORKERS.values():
-            if w.proc.is_alive():
-                w.proc.terminate()
-        for w in WORKERS.values():
-            w.proc.join(timeout=5)
+        terminate_processes([w.proc for w in WORKERS.values()] + _drain_reaping(), grace_sec=5.0)
         WORKERS.clear()
         RUNNING.clear()
     queue.persist_queue_snapshot(reason="kill_workers")
+    flush_jsonl()  # workers' last usage/metrics lines land before any restart
+    flush_outbox()  # queued notifications too (restart paths execv, skipping atexit)
+    flush_state_if_needed(force=True)  # deferred fields (tg_offset, budget message counter)
     if cleared_running:
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": utc_now_iso(),
                 "type": "running_cleared_on_kill", "count": cleared_running,
             },
         )
@@ -478,20 +537,24 @@ def respawn_worker(wid: int) -> None:
 def assign_tasks() -> None:
     from supervisor import queue
     from supervisor.state import budget_remaining, EVOLUTION_BUDGET_RESERVE
+    evolution_affordable: Optional[bool] = None  # resolved at most once per pass
     with _queue_lock:
         for w in WORKERS.values():
             if w.busy_task_id is None and PENDING:
                 # Find first suitable task (skip over-budget evolution tasks)
                 chosen_idx = None
                 for i, candidate in enumerate(PENDING):
-                    if str(candidate.get("type") or "") == "evolution" and budget_remaining(load_state()) < EVOLUTION_BUDGET_RESERVE:
-                        continue
+                    if str(candidate.get("type") or "") == "evolution":
+                        if evolution_affordable is None:
+                            evolution_affordable = budget_remaining(peek_state()) >= EVOLUTION_BUDGET_RESERVE
+                        if not evolution_affordable:
+                            continue
                     chosen_idx = i
                     break
                 if chosen_idx is None:
                     # Only over-budget evolution tasks remain — clean them out
-                    PENDING[:] = [t for t in PENDING if str(t.get("type") or "") != "evolution"]
-                    queue.persist_queue_snapshot(reason="evolution_dropped_budget")
+                    queue.drop_pending_by_type("evolution")
+                    queue.mark_snapshot_dirty(reason="evolution_dropped_budget")
                     continue
                 task = PENDING.pop(chosen_idx)
                 w.busy_task_id = task["id"]
@@ -504,14 +567,14 @@ def assign_tasks() -> None:
                 }
                 task_type = str(task.get("type") or "")
                 if task_type in ("evolution", "review"):
-                    st = load_state()
+                    st = peek_state()
                     if st.get("owner_chat_id"):
                         emoji = '🧬' if task_type == 'evolution' else '🔎'
                         send_with_budget(
                             int(st["owner_chat_id"]),
                             f"{emoji} {task_type.capitalize()} task {task['id']} started.",
                         )
-                queue.persist_queue_snapshot(reason="assign_task")
+                queue.mark_snapshot_dirty(reason="assign_task")
 
 
 # ---------------------------------------------------------------------------
@@ -520,6 +583,7 @@ def assign_tasks() -> None:
 
 def ensure_workers_healthy() -> None:
     from supervisor import queue
+    reap_terminated()
     # Grace period: skip health check right after spawn — workers need time to initialize
     if (time.time() - _LAST_SPAWN_TIME) < _SPAWN_GRACE_SEC:
         return
@@ -533,7 +597,7 @@ def ensure_workers_healthy() -> None:
             append_jsonl(
                 DRIVE_ROOT / "logs" / "supervisor.jsonl",
                 {
-                    "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    "ts": utc_now_iso(),
                     "type": "worker_dead_detected",
                     "worker_id": wid,
                     "exitcode": w.proc.exitcode,
@@ -546,7 +610,7 @@ def ensure_workers_healthy() -> None:
                 if isinstance(task, dict):
                     queue.enqueue_task(task, front=True)
             respawn_worker(wid)
-            queue.persist_queue_snapshot(reason="worker_respawn_after_crash")
+            queue.mark_snapshot_dirty(reason="worker_respawn_after_crash")
 
     now = time.time()
     alive_now = sum(1 for w in WORKERS.values() if w.proc.is_alive())
@@ -561,7 +625,8 @@ def ensure_workers_healthy() -> None:
             # not a crash storm condition.
             CRASH_TS.clear()
 
-    CRASH_TS[:] = [t for t in CRASH_TS if (now - t) < 60.0]
+    while CRASH_TS and (now - CRASH_TS[0]) >= 60.0:
+        CRASH_TS.popleft()
     if len(CRASH_TS) >= 3:
         # Log crash storm but DON'T execv restart — that creates infinite loops.
         # Instead: kill dead workers, notify owner, continue with direct-chat (threading).
@@ -569,7 +634,7 @@ def ensure_workers_healthy() -> None:
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": utc_now_iso(),
                 "type": "crash_storm_detected",
                 "crash_count": len(CRASH_TS),
                 "worker_count": len(WORKERS),
@@ -586,3 +651,28 @@ def ensure_workers_healthy() -> None:
         CRASH_TS.clear()
 
 
+def log_main_loop_heartbeat(offset: int) -> None:
+    """Write the periodic main_loop_heartbeat diagnostic to supervisor.jsonl.
+
+    Reads state via peek_state() so it never depends on the launcher having
+    loaded state earlier in the tick (e.g. before any Telegram update).
+    """
+    try:
+        event_q_size = int(get_event_q().qsize())
+    except Exception:
+        event_q_size = -1
+    append_jsonl_deferred(
+        DRIVE_ROOT / "logs" / "supervisor.jsonl",
+        {
+            "ts": utc_now_iso(),
+            "type": "main_loop_heartbeat",
+            "offset": offset,
+            "workers_total": len(WORKERS),
+            "workers_alive": sum(1 for w in WORKERS.values() if w.proc.is_alive()),
+            "pending_count": len(PENDING),
+            "running_count": len(RUNNING),
+            "event_q_size": event_q_size,
+            "running_task_ids": list(itertools.islice(RUNNING, 5)),
+            "spent_usd": peek_state().get("spent_usd"),
+        },
+    )
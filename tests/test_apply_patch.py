@@ -0,0 +1,90 @@
+"""Tests for the apply_patch shim script (executed in-process, not installed)."""
+
+import os
+import pathlib
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _load_script():
+    from ouroboros.apply_patch import APPLY_PATCH_CODE
+    ns = {"__name__": "apply_patch_under_test"}
+    exec(compile(APPLY_PATCH_CODE, "apply_patch", "exec"), ns)
+    return ns
+
+
+def _naive_find(hay, needle):
+    for i in range(len(hay) - len(needle) + 1):
+        if hay[i:i + len(needle)] == needle:
+            return i
+    return -1
+
+
+class TestFindSubseq(unittest.TestCase):
+    """Test hunk matching against a straightforward reference scan."""
+
+    def setUp(self):
+        self.ns = _load_script()
+
+    def test_edge_cases(self):
+        find = self.ns["_find_subseq"]
+        self.assertEqual(find(["a", "b"], []), 0)
+        self.assertEqual(find(["a"], ["a", "b"]), -1)
+        self.assertEqual(find(["x", "a", "b"], ["a", "b"]), 1)
+        self.assertEqual(find(["a", "a", "a", "b"], ["a", "a", "b"]), 1)
+
+    def test_matches_reference_on_random_input(self):
+        find = self.ns["_find_subseq"]
+        rng = random.Random(1234)
+        for _ in range(300):
+            hay = [rng.choice("abc") for _ in range(rng.randint(0, 30))]
+            needle = [rng.choice("abc") for _ in range(rng.randint(1, 4))]
+            self.assertEqual(find(hay, needle), _naive_find(hay, needle), (hay, needle))
+            self.assertEqual(find(hay, needle, [hash(x) for x in hay]), _naive_find(hay, needle))
+
+
+    def test_hash_collisions_fall_back_to_string_compare(self):
+        self.ns["hash"] = lambda x: 0  # shadows the builtin inside the script
+        find = self.ns["_find_subseq"]
+        self.assertEqual(find(["a", "b", "a", "c"], ["a", "c"]), 2)
+        self.assertEqual(find(["a", "b"], ["c"]), -1)
+
+
+class TestApplyUpdateFile(unittest.TestCase):
+    """Test that update hunks are applied in order."""
+
+    def test_update_multiple_hunks(self):
+        ns = _load_script()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp) / "f.py"
+            path.write_text("a\nb\nc\nd\ne\n", encoding="utf-8")
+            ns["apply_update_file"](str(path), [[" a", "-b", "+B"], [" d", "-e", "+E", "+F"]])
+            self.assertEqual(path.read_text(encoding="utf-8"), "a\nB\nc\nd\nE\nF\n")
+
+
+class TestInstall(unittest.TestCase):
+    """Test that install() only rewrites the script when it changed."""
+
+    def test_skips_write_when_current(self):
+        from unittest.mock import patch
+
+        import ouroboros.apply_patch as ap
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp) / "bin" / "apply_patch"
+            with patch.object(ap, "APPLY_PATCH_PATH", path):
+                ap.install()
+                self.assertEqual(path.read_text(encoding="utf-8"), ap.APPLY_PATCH_CODE)
+                self.assertEqual(path.stat().st_mode & 0o777, 0o755)
+                with patch.object(pathlib.Path, "write_bytes", side_effect=AssertionError("rewrite")):
+                    ap.install()
+                path.write_text("stale", encoding="utf-8")
+                ap.install()
+                self.assertEqual(path.read_text(encoding="utf-8"), ap.APPLY_PATCH_CODE)
+
+
+if __name__ == "__main__":
+    unittest.main()
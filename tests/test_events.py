@@ -0,0 +1,107 @@
+"""Tests for supervisor.events batched draining."""
+
+import os
+import queue
+import shutil
+import sys
+import types
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestDrainEvents(unittest.TestCase):
+    """Test that a drained batch dispatches every event and persists once."""
+
+    def _ctx(self, persisted):
+        return types.SimpleNamespace(
+            RUNNING={f"t{i}": {"task": {"type": "task"}} for i in range(3)},
+            persist_queue_snapshot=lambda reason="": persisted.append(reason),
+        )
+
+    def test_batch_coalesces_snapshots(self):
+        from supervisor.events import drain_events
+        q, persisted = queue.Queue(), []
+        ctx = self._ctx(persisted)
+        for i in range(3):
+            q.put({"type": "task_heartbeat", "task_id": f"t{i}", "phase": "p"})
+        self.assertEqual(drain_events(q, ctx, max_batch=2), 2)
+        self.assertEqual(drain_events(q, ctx, max_batch=2), 1)
+        self.assertEqual(drain_events(q, ctx), 0)
+        self.assertTrue(all(m.get("heartbeat_phase") == "p" for m in ctx.RUNNING.values()))
+
+    def test_wait_wakes_on_event(self):
+        import threading
+        import time
+
+        from supervisor.events import drain_events
+        q, persisted = queue.Queue(), []
+        ctx = self._ctx(persisted)
+        threading.Timer(0.05, q.put, args=({"type": "task_heartbeat", "task_id": "t0"},)).start()
+        started = time.monotonic()
+        self.assertEqual(drain_events(q, ctx, wait_sec=5.0), 1)
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertEqual(drain_events(q, ctx, wait_sec=0.01), 0)
+
+    def test_single_persist_per_batch(self):
+        from supervisor import events
+        q, persisted, calls = queue.Queue(), [], []
+        ctx = self._ctx(persisted)
+
+        def handler(evt, c):
+            calls.append(evt["n"])
+            c.persist_queue_snapshot(reason=f"r{evt['n']}")
+
+        for n in range(5):
+            q.put({"type": "_test", "n": n})
+        events.EVENT_HANDLERS["_test"] = handler
+        try:
+            events.drain_events(q, ctx)
+        finally:
+            del events.EVENT_HANDLERS["_test"]
+        self.assertEqual(calls, list(range(5)))
+        self.assertEqual(persisted, ["r4"])
+
+
+@unittest.skipUnless(shutil.which("git"), "git not installed")
+class TestPromoteToStable(unittest.TestCase):
+    """Test the off-loop dev -> stable promotion."""
+
+    def test_pushes_dev_to_stable_and_reports_sha(self):
+        import pathlib
+        import subprocess
+        import tempfile
+
+        from supervisor.events import _promote_to_stable
+
+        def git(cwd, *args):
+            return subprocess.run(["git", *args], cwd=str(cwd), check=True,
+                                  capture_output=True, text=True).stdout.strip()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = pathlib.Path(tmp)
+            origin, repo = root / "origin.git", root / "repo"
+            git(root, "init", "-q", "--bare", str(origin))
+            git(root, "clone", "-q", str(origin), str(repo))
+            git(repo, "config", "user.name", "t")
+            git(repo, "config", "user.email", "t@example.com")
+            git(repo, "checkout", "-q", "-b", "dev")
+            (repo / "a.txt").write_text("a\n")
+            git(repo, "add", "a.txt")
+            git(repo, "commit", "-q", "-m", "init")
+            git(repo, "push", "-q", "-u", "origin", "dev")
+            sent = []
+            ctx = types.SimpleNamespace(
+                REPO_DIR=repo, BRANCH_DEV="dev", BRANCH_STABLE="stable",
+                load_state=lambda: {"owner_chat_id": 1},
+                send_with_budget=lambda chat_id, text: sent.append(text),
+            )
+            _promote_to_stable(ctx)
+            _promote_to_stable(ctx)  # already up to date: still succeeds
+            sha = git(origin, "rev-parse", "stable")
+            self.assertEqual(sha, git(repo, "rev-parse", "dev"))
+            self.assertEqual(sent, [f"✅ Promoted: dev → stable ({sha[:8]})"] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+"""Tests for supervisor.git_ops repo-state helpers (uses a throwaway git repo)."""
+
+import os
+import pathlib
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", *args], cwd=str(cwd), check=True, capture_output=True)
+
+
+@unittest.skipUnless(shutil.which("git"), "git not installed")
+class TestCollectRepoSyncState(unittest.TestCase):
+    """Test the porcelain=v2 based sync-state collection."""
+
+    def setUp(self):
+        from supervisor import git_ops
+        self._tmpdir = tempfile.TemporaryDirectory()
+        root = pathlib.Path(self._tmpdir.name)
+        self.origin, self.repo = root / "origin.git", root / "repo"
+        _git(root, "init", "-q", "--bare", str(self.origin))
+        _git(root, "clone", "-q", str(self.origin), str(self.repo))
+        _git(self.repo, "config", "user.name", "t")
+        _git(self.repo, "config", "user.email", "t@example.com")
+        _git(self.repo, "checkout", "-q", "-b", "dev")
+        (self.repo / "a.txt").write_text("a\n")
+        _git(self.repo, "add", "a.txt")
+        _git(self.repo, "commit", "-q", "-m", "init")
+        _git(self.repo, "push", "-q", "-u", "origin", "dev")
+        self._saved = (git_ops.REPO_DIR, git_ops.DRIVE_ROOT, git_ops.REMOTE_URL)
+        git_ops.init(self.repo, root / "drive", str(self.origin))
+
+    def tearDown(self):
+        from supervisor import git_ops
+        git_ops.init(*self._saved)
+        self._tmpdir.cleanup()
+
+    def test_clean(self):
+        from supervisor.git_ops import _collect_repo_sync_state
+        st = _collect_repo_sync_state()
+        self.assertEqual(st["current_branch"], "dev")
+        self.assertEqual(st["dirty_lines"], [])
+        self.assertEqual(st["unpushed_lines"], [])
+
+    def test_dirty_and_unpushed(self):
+        from supervisor.git_ops import _collect_repo_sync_state
+        (self.repo / "a.txt").write_text("b\n")
+        _git(self.repo, "commit", "-q", "-am", "second")
+        (self.repo / "a.txt").write_text("c\n")
+        (self.repo / "new.txt").write_text("n\n")
+        st = _collect_repo_sync_state()
+        self.assertEqual(sorted(st["dirty_lines"]), [" M a.txt", "?? new.txt"])
+        self.assertEqual(len(st["unpushed_lines"]), 1)
+        self.assertIn("second", st["unpushed_lines"][0])
+
+
+class TestSyncRuntimeDependencies(unittest.TestCase):
+    """Test that pip is skipped while requirements.txt is unchanged."""
+
+    def test_skips_pip_for_unchanged_requirements(self):
+        from unittest.mock import patch
+
+        from supervisor import git_ops
+        saved = (git_ops.REPO_DIR, git_ops.DRIVE_ROOT, git_ops.REMOTE_URL)
+        with tempfile.TemporaryDirectory() as tmp:
+            root = pathlib.Path(tmp)
+            git_ops.init(root, root / "drive", "")
+            (root / "requirements.txt").write_text("requests\n")
+            try:
+                with patch.object(git_ops, "_deps_marker_path", return_value=root / "deps_ok.txt"), \
+                        patch.object(git_ops.subprocess, "run") as run:
+                    self.assertTrue(git_ops.sync_runtime_dependencies("t1")[0])
+                    ok, msg = git_ops.sync_runtime_dependencies("t2")
+                    self.assertTrue(ok)
+                    self.assertIn("cached", msg)
+                    self.assertEqual(run.call_count, 1)
+                    (root / "requirements.txt").write_text("requests\nhttpx\n")
+                    git_ops.sync_runtime_dependencies("t3")
+                    self.assertEqual(run.call_count, 2)
+            finally:
+                git_ops.init(*saved)
+
+
+class TestImportTest(unittest.TestCase):
+    """Test that an import pass is cached per sha in a VM-local marker."""
+
+    def test_cached_per_sha(self):
+        from unittest.mock import patch
+
+        from supervisor import git_ops
+        with tempfile.TemporaryDirectory() as tmp:
+            marker = pathlib.Path(tmp) / "import_ok.txt"
+            ok = subprocess.CompletedProcess([], 0, "import_ok\n", "")
+            with patch.object(git_ops, "_import_test_marker_path", return_value=marker), \
+                    patch.object(git_ops, "load_state", return_value={"current_sha": "abc"}), \
+                    patch.object(git_ops.subprocess, "run", return_value=ok) as run:
+                self.assertTrue(git_ops.import_test()["ok"])
+                self.assertIn("cached", git_ops.import_test()["stdout"])
+                self.assertEqual(run.call_count, 1)
+                marker.unlink()  # fresh VM: Drive state survives, the marker doesn't
+                git_ops.import_test()
+                self.assertEqual(run.call_count, 2)
+
+
+class TestRemovePycacheDirs(unittest.TestCase):
+    """Test __pycache__ cleanup after checkout."""
+
+    def test_removes_nested_and_skips_git(self):
+        from supervisor.git_ops import _remove_pycache_dirs
+        with tempfile.TemporaryDirectory() as tmp:
+            root = pathlib.Path(tmp)
+            for d in ("__pycache__", "pkg/__pycache__", "pkg/sub/__pycache__", ".git/__pycache__"):
+                (root / d).mkdir(parents=True)
+                (root / d / "x.pyc").write_bytes(b"")
+            _remove_pycache_dirs(root)
+            self.assertEqual(sorted(str(p.relative_to(root)) for p in root.rglob("__pycache__")),
+                             [".git/__pycache__"])
+
+
+if __name__ == "__main__":
+    unittest.main()
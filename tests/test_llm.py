@@ -0,0 +1,47 @@
+"""Tests for LLM client rate limiting helpers."""
+
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestParseResetSeconds(unittest.TestCase):
+    """Test parsing of Retry-After / x-ratelimit-reset header values."""
+
+    def test_formats(self):
+        from ouroboros.llm import _parse_reset_seconds
+        now = 1_700_000_000.0
+        self.assertEqual(_parse_reset_seconds("7", now), 7.0)
+        self.assertAlmostEqual(_parse_reset_seconds(str(int((now + 5) * 1000)), now), 5.0, places=3)
+        self.assertAlmostEqual(_parse_reset_seconds(str(int(now + 3)), now), 3.0)
+        self.assertAlmostEqual(_parse_reset_seconds("1m30s", now), 90.0)
+        self.assertAlmostEqual(_parse_reset_seconds("250ms", now), 0.25)
+        self.assertIsNone(_parse_reset_seconds("", now))
+        self.assertIsNone(_parse_reset_seconds("soon", now))
+
+
+class TestRateGate(unittest.TestCase):
+    """Test that the gate holds requests after a 429 with Retry-After."""
+
+    def test_retry_after_blocks_next_request(self):
+        from ouroboros.llm import _RateGate
+        gate = _RateGate()
+        gate.observe(429, {"retry-after": "0.2"})
+        start = time.monotonic()
+        gate.wait()
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+    def test_ok_response_does_not_block(self):
+        from ouroboros.llm import _RateGate
+        gate = _RateGate()
+        gate.observe(200, {"x-ratelimit-remaining-requests": "10", "x-ratelimit-reset-requests": "30s"})
+        start = time.monotonic()
+        gate.wait()
+        self.assertLess(time.monotonic() - start, 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
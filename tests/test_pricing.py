@@ -0,0 +1,74 @@
+"""Tests for model pricing fetch/cache and cost estimation."""
+
+import os
+import pathlib
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestPricingCache(unittest.TestCase):
+    """Test the on-disk /v1/models pricing cache."""
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.cache_path = pathlib.Path(self._tmpdir.name) / "pricing.json"
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def test_cache_roundtrip(self):
+        from ouroboros.llm import _read_pricing_cache, _write_pricing_cache
+        pricing = {"anthropic/claude-sonnet-4.6": (3.0, 0.3, 15.0)}
+        _write_pricing_cache(self.cache_path, pricing)
+        self.assertEqual(_read_pricing_cache(self.cache_path, ttl_sec=60), pricing)
+
+    def test_cache_expired(self):
+        from ouroboros.llm import _read_pricing_cache, _write_pricing_cache
+        _write_pricing_cache(self.cache_path, {"x/y": (1.0, 0.1, 2.0)})
+        old = time.time() - 120
+        os.utime(self.cache_path, (old, old))
+        self.assertIsNone(_read_pricing_cache(self.cache_path, ttl_sec=60))
+
+    def test_malformed_cache_rejected(self):
+        from ouroboros.llm import _read_pricing_cache
+        for bad in ('[]', '{"x/y": [1.0, 0.1]}', '{"x/y": [1.0, 0.1, -2.0]}',
+                    '{"x/y": ["1", 0.1, 2.0]}', '{"x/y": [1.0, 0.1, NaN]}', 'not json'):
+            self.cache_path.write_text(bad, encoding="utf-8")
+            self.assertIsNone(_read_pricing_cache(self.cache_path, ttl_sec=60), bad)
+
+    def test_write_creates_cache_dir(self):
+        from ouroboros.llm import _read_pricing_cache, _write_pricing_cache
+        path = self.cache_path.parent / "ouroboros" / "pricing_cache.json"
+        _write_pricing_cache(path, {"x/y": (1.0, 0.1, 2.0)})
+        self.assertEqual(_read_pricing_cache(path, ttl_sec=60), {"x/y": (1.0, 0.1, 2.0)})
+        self.assertEqual(path.parent.stat().st_mode & 0o777, 0o700)
+
+    def test_fetch_uses_fresh_cache(self):
+        import ouroboros.llm as llm
+        pricing = {"openai/o3": (2.0, 0.5, 8.0)}
+        llm._write_pricing_cache(self.cache_path, pricing)
+        with patch.object(llm, "PRICING_CACHE_PATH", self.cache_path), \
+                patch.object(llm, "_get_http", side_effect=AssertionError("network hit")):
+            self.assertEqual(llm.fetch_openrouter_pricing(), pricing)
+
+
+class TestEstimateCost(unittest.TestCase):
+    """Test pricing resolution used by the tool loop."""
+
+    def test_prefix_match_resolves_longest_key(self):
+        import ouroboros.loop as loop
+        pricing = {"anthropic/claude": (1.0, 0.1, 1.0), "anthropic/claude-sonnet-4": (3.0, 0.3, 15.0)}
+        with patch.object(loop, "_get_pricing", return_value=pricing), \
+                patch.dict(loop._resolved_pricing, clear=True):
+            self.assertEqual(loop._resolve_pricing("anthropic/claude-sonnet-4-20250514"), (3.0, 0.3, 15.0))
+            self.assertIsNone(loop._resolve_pricing("unknown/model"))
+            self.assertEqual(loop._estimate_cost("unknown/model", 1000, 1000), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
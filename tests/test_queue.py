@@ -0,0 +1,171 @@
+"""Tests for supervisor queue ordering."""
+
+import json
+import os
+import pathlib
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestEnqueueOrdering(unittest.TestCase):
+    """Test that PENDING stays sorted by (priority, seq) on insert."""
+
+    def setUp(self):
+        from supervisor import queue
+        self._saved = (queue.PENDING, queue.RUNNING, queue.QUEUE_SEQ_COUNTER_REF)
+        self.pending = []
+        queue.init_queue_refs(self.pending, {}, {"value": 0})
+
+    def tearDown(self):
+        from supervisor import queue
+        queue.init_queue_refs(*self._saved)
+
+    def test_priority_then_fifo_with_front(self):
+        from supervisor.queue import _queue_sort_key, enqueue_task
+        enqueue_task({"id": "e1", "type": "evolution"})
+        enqueue_task({"id": "t1", "type": "task"})
+        enqueue_task({"id": "x1", "type": "other"})
+        enqueue_task({"id": "t2", "type": "task"})
+        enqueue_task({"id": "t0", "type": "task"}, front=True)
+        enqueue_task({"id": "r1", "type": "review"})
+        self.assertEqual([t["id"] for t in self.pending], ["t0", "t1", "t2", "r1", "e1", "x1"])
+        self.assertEqual(self.pending, sorted(self.pending, key=_queue_sort_key))
+
+    def test_enqueue_normalizes_types(self):
+        from supervisor.queue import enqueue_task
+        t = enqueue_task({"id": "a", "type": "task", "priority": "2", "_attempt": "3"})
+        self.assertEqual((t["priority"], t["_attempt"]), (2, 3))
+        t = enqueue_task({"id": "b", "type": "evolution"})
+        self.assertEqual((t["priority"], t["_attempt"]), (1, 1))
+
+
+class TestTypeCountedContainers(unittest.TestCase):
+    """Test that per-type counts track PENDING/RUNNING mutations."""
+
+    def setUp(self):
+        from supervisor import queue
+        self._saved = (queue.PENDING, queue.RUNNING, queue.QUEUE_SEQ_COUNTER_REF)
+        self.pending, self.running = queue.TypeCountedList(), queue.TypeCountedDict()
+        queue.init_queue_refs(self.pending, self.running, {"value": 0})
+
+    def tearDown(self):
+        from supervisor import queue
+        queue.init_queue_refs(*self._saved)
+
+    def test_pending_mutations(self):
+        from supervisor.queue import enqueue_task, queue_has_task_type
+        enqueue_task({"id": "e1", "type": "evolution"})
+        enqueue_task({"id": "t1", "type": "task"})
+        enqueue_task({"id": "t2", "type": "task"})
+        self.assertEqual(self.pending.type_counts, {"evolution": 1, "task": 2})
+        self.pending.pop(0)
+        self.pending[:] = [t for t in self.pending if t["id"] != "e1"]
+        self.assertEqual(self.pending.type_counts, {"task": 1})
+        self.assertFalse(queue_has_task_type("evolution"))
+        self.pending.clear()
+        self.assertEqual(self.pending.type_counts, {})
+
+    def test_cancel_pending_by_id(self):
+        from supervisor.queue import cancel_task_by_id, enqueue_task
+        for tid, tt in (("e1", "evolution"), ("t1", "task"), ("t2", "task"), ("r1", "review")):
+            enqueue_task({"id": tid, "type": tt})
+        self.assertTrue(cancel_task_by_id("t2"))
+        self.assertTrue(cancel_task_by_id("e1"))
+        self.assertFalse(cancel_task_by_id("missing"))
+        self.assertEqual([t["id"] for t in self.pending], ["t1", "r1"])
+        self.assertEqual(set(self.pending.by_id), {"t1", "r1"})
+
+    def test_cancel_duplicate_id_after_index_entry_dropped(self):
+        from supervisor.queue import cancel_task_by_id, enqueue_task
+        enqueue_task({"id": "dup", "type": "task", "text": "first"})
+        enqueue_task({"id": "dup", "type": "task", "text": "second"})
+        self.pending.pop(1)  # the indexed duplicate: by_id no longer has "dup"
+        self.assertTrue(cancel_task_by_id("dup"))
+        self.assertEqual(list(self.pending), [])
+        self.assertFalse(cancel_task_by_id("dup"))
+
+    def test_drop_pending_by_type(self):
+        from supervisor import queue
+        from supervisor.queue import drop_pending_by_type, enqueue_task
+        for tid, tt in (("t1", "task"), ("e1", "evolution"), ("e2", "evolution"), ("t2", "task")):
+            enqueue_task({"id": tid, "type": tt})
+        self.assertEqual(drop_pending_by_type("evolution"), 2)
+        self.assertIs(queue.PENDING, self.pending)  # mutated in place, not rebound
+        self.assertEqual([t["id"] for t in self.pending], ["t1", "t2"])
+        self.assertEqual(self.pending.type_counts, {"task": 2})
+        self.assertEqual(drop_pending_by_type("evolution"), 0)
+
+    def test_running_mutations(self):
+        from supervisor.queue import queue_has_task_type, running_task_type_counts
+        self.running["a"] = {"task": {"type": "review"}}
+        self.running["b"] = {"task": {"type": "task"}}
+        self.running["a"] = {"task": {"type": "task"}}
+        self.assertEqual(running_task_type_counts(), {"task": 2})
+        self.assertFalse(queue_has_task_type("review"))
+        self.running.pop("a")
+        self.running.pop("missing", None)
+        del self.running["b"]
+        self.assertEqual(running_task_type_counts(), {})
+
+
+class TestSnapshotDebounce(unittest.TestCase):
+    """Test that dirty marks coalesce into rate-limited snapshot writes."""
+
+    def setUp(self):
+        import tempfile
+
+        from supervisor import queue
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self._saved = (queue.PENDING, queue.RUNNING, queue.QUEUE_SEQ_COUNTER_REF,
+                       queue.QUEUE_SNAPSHOT_PATH, queue.DRIVE_ROOT)
+        queue.init_queue_refs([], {}, {"value": 0})
+        queue.DRIVE_ROOT = pathlib.Path(self._tmpdir.name)
+        queue.QUEUE_SNAPSHOT_PATH = pathlib.Path(self._tmpdir.name) / "queue_snapshot.json"
+        queue._LAST_SNAPSHOT_KEY = None
+
+    def tearDown(self):
+        from supervisor import queue
+        queue.init_queue_refs(*self._saved[:3])
+        queue.QUEUE_SNAPSHOT_PATH, queue.DRIVE_ROOT = self._saved[3:]
+        self._tmpdir.cleanup()
+
+    def test_marks_coalesce(self):
+        from unittest.mock import patch
+
+        from supervisor import queue
+        queue.persist_queue_snapshot(reason="startup")
+        queue.enqueue_task({"id": "t1", "type": "task"})
+        with patch.object(queue, "persist_queue_snapshot", wraps=queue.persist_queue_snapshot) as persist:
+            for i in range(10):
+                queue.mark_snapshot_dirty(reason=f"r{i}")
+            self.assertFalse(queue.maybe_flush_snapshot(min_interval=60))
+            self.assertTrue(queue.maybe_flush_snapshot(min_interval=0))
+            self.assertFalse(queue.maybe_flush_snapshot(min_interval=0))
+        persist.assert_called_once_with(reason="r9")
+        self.assertEqual(json.loads(queue.QUEUE_SNAPSHOT_PATH.read_text())["reason"], "r9")
+
+    def test_unchanged_queue_skips_write(self):
+        from supervisor import queue
+        queue.persist_queue_snapshot(reason="first")
+        queue.QUEUE_SNAPSHOT_PATH.unlink()
+        queue.persist_queue_snapshot(reason="second")
+        self.assertFalse(queue.QUEUE_SNAPSHOT_PATH.exists())
+        queue.enqueue_task({"id": "t1", "type": "task"})
+        queue.persist_queue_snapshot(reason="third")
+        self.assertEqual(json.loads(queue.QUEUE_SNAPSHOT_PATH.read_text())["reason"], "third")
+
+    def test_restore_roundtrip(self):
+        from supervisor import queue
+        queue.enqueue_task({"id": "t1", "type": "task", "chat_id": 1, "text": "hi"})
+        queue.enqueue_task({"id": "r1", "type": "review", "chat_id": 1, "review_reason": "x"})
+        queue.persist_queue_snapshot(reason="test")
+        queue.PENDING.clear()
+        self.assertEqual(queue.restore_pending_from_snapshot(), 2)
+        self.assertEqual([(t["id"], t.get("text"), t.get("review_reason")) for t in queue.PENDING],
+                         [("t1", "hi", None), ("r1", None, "x")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+"""Tests for supervisor state persistence (load/save, caching, locks)."""
+
+import json
+import os
+import pathlib
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestStateCache(unittest.TestCase):
+    """Test the mtime/inode-guarded in-process state snapshot."""
+
+    def setUp(self):
+        from supervisor import state
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.drive_root = pathlib.Path(self._tmpdir.name)
+        self._old_root = state.DRIVE_ROOT
+        state.init(self.drive_root)
+
+    def tearDown(self):
+        from supervisor import state
+        state.init(self._old_root)
+        self._tmpdir.cleanup()
+
+    def test_save_then_load_roundtrip(self):
+        from supervisor.state import load_state, save_state
+        st = load_state()
+        st["owner_id"] = 42
+        save_state(st)
+        self.assertEqual(load_state()["owner_id"], 42)
+
+    def test_load_returns_private_copy(self):
+        from supervisor.state import load_state
+        st = load_state()
+        st["owner_id"] = 99
+        self.assertIsNone(load_state()["owner_id"])
+
+    def test_external_write_invalidates_cache(self):
+        from supervisor.state import STATE_PATH, atomic_write_text, load_state
+        st = load_state()
+        st["owner_id"] = 7
+        atomic_write_text(STATE_PATH, json.dumps(st))
+        self.assertEqual(load_state()["owner_id"], 7)
+
+
+class TestAtomicWriteText(unittest.TestCase):
+    """Test tmp-file handling in atomic_write_text."""
+
+    def test_no_tmp_left_behind(self):
+        from unittest.mock import patch
+
+        from supervisor import state
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp) / "snap.json"
+            for durable in (True, False):
+                state.atomic_write_text(path, "x" * 10, durable=durable)
+            with patch.object(state.os, "replace", side_effect=OSError("boom")):
+                with self.assertRaises(OSError):
+                    state.atomic_write_text(path, "y")
+            self.assertEqual(os.listdir(tmp), ["snap.json"])
+            self.assertEqual(path.read_text(), "x" * 10)
+
+
+class TestDeferredStateUpdates(unittest.TestCase):
+    """Test coalesced field updates (tg_offset etc.) and their flushing."""
+
+    def setUp(self):
+        from supervisor import state
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self._old_root = state.DRIVE_ROOT
+        state.init(pathlib.Path(self._tmpdir.name))
+        state.save_state(state.load_state())
+
+    def tearDown(self):
+        from supervisor import state
+        state._PENDING_UPDATES.clear()
+        state.init(self._old_root)
+        self._tmpdir.cleanup()
+
+    def _on_disk(self):
+        from supervisor import state
+        return json.loads(state.STATE_PATH.read_text())
+
+    def test_overlay_then_flush(self):
+        from supervisor import state
+        state.update_state_deferred(tg_offset=7)
+        self.assertEqual(state.load_state()["tg_offset"], 7)
+        self.assertEqual(state.peek_state()["tg_offset"], 7)
+        self.assertNotEqual(self._on_disk()["tg_offset"], 7)
+        state._LAST_STATE_FLUSH = 0.0
+        self.assertTrue(state.flush_state_if_needed())
+        self.assertEqual(self._on_disk()["tg_offset"], 7)
+        self.assertFalse(state.flush_state_if_needed())
+
+    def test_save_state_folds_in_pending(self):
+        from supervisor import state
+        st = state.load_state()
+        state.update_state_deferred(tg_offset=9)
+        st["owner_id"] = 1
+        state.save_state(st)
+        self.assertEqual((self._on_disk()["owner_id"], self._on_disk()["tg_offset"]), (1, 9))
+        self.assertEqual(state._PENDING_UPDATES, {})
+
+    def test_explicit_save_beats_older_pending(self):
+        from supervisor import state
+        state.update_state_deferred(tg_offset=10)
+        st = state.load_state()
+        st["tg_offset"] = 11  # e.g. /restart acking itself before os.execv
+        state.save_state(st)
+        state.flush_state_if_needed(force=True)
+        self.assertEqual(self._on_disk()["tg_offset"], 11)
+        self.assertEqual(state.load_state()["tg_offset"], 11)
+        self.assertEqual(state._PENDING_UPDATES, {})
+
+
+class TestPeekState(unittest.TestCase):
+    """Test the read-only, copy-free state view."""
+
+    def setUp(self):
+        from supervisor import state
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self._old_root = state.DRIVE_ROOT
+        state.init(pathlib.Path(self._tmpdir.name))
+
+    def tearDown(self):
+        from supervisor import state
+        state.init(self._old_root)
+        self._tmpdir.cleanup()
+
+    def test_peek_reflects_saves_and_is_read_only(self):
+        from supervisor.state import load_state, peek_state, save_state
+        st = load_state()
+        st["owner_id"] = 42
+        save_state(st)
+        view = peek_state()
+        self.assertEqual(view["owner_id"], 42)
+        with self.assertRaises(TypeError):
+            view["owner_id"] = 1
+
+
+class TestStateDefaults(unittest.TestCase):
+    """Test state normalization."""
+
+    def test_fills_missing_and_drops_legacy(self):
+        from supervisor.state import ensure_state_defaults
+        st = ensure_state_defaults({"spent_usd": 1.5, "approvals": {}})
+        self.assertEqual(st["spent_usd"], 1.5)
+        self.assertEqual(st["tg_offset"], 0)
+        self.assertTrue(st["session_id"])
+        self.assertNotIn("approvals", st)
+
+    def test_normalized_state_returned_unchanged(self):
+        from supervisor.state import default_state_dict, ensure_state_defaults
+        st = default_state_dict()
+        before = dict(st)
+        self.assertIs(ensure_state_defaults(st), st)
+        self.assertEqual(st, before)
+
+
+class TestFileLock(unittest.TestCase):
+    """Test acquire/release of the state file lock."""
+
+    def test_contended_lock_times_out_then_reacquires(self):
+        from supervisor.state import acquire_file_lock, release_file_lock
+        with tempfile.TemporaryDirectory() as tmp:
+            lock_path = pathlib.Path(tmp) / "locks" / "state.lock"
+            fd = acquire_file_lock(lock_path)
+            self.assertIsNotNone(fd)
+            self.assertIsNone(acquire_file_lock(lock_path, timeout_sec=0.05))
+            release_file_lock(lock_path, fd)
+            fd2 = acquire_file_lock(lock_path, timeout_sec=0.5)
+            self.assertIsNotNone(fd2)
+            release_file_lock(lock_path, fd2)
+
+
+class TestRotateChatLog(unittest.TestCase):
+    """Test size tracking and rotation of logs/chat.jsonl."""
+
+    def setUp(self):
+        from supervisor import state
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.root = pathlib.Path(self._tmpdir.name)
+        self.chat = self.root / "logs" / "chat.jsonl"
+        self.chat.parent.mkdir(parents=True)
+        state._CHAT_LOG_APPROX_BYTES = None
+
+    def tearDown(self):
+        from supervisor import state
+        state._CHAT_LOG_APPROX_BYTES = None
+        self._tmpdir.cleanup()
+
+    def test_stats_only_when_tracked_size_reaches_limit(self):
+        from unittest.mock import patch
+
+        from supervisor import state
+        self.chat.write_bytes(b"x" * 60)
+        state.rotate_chat_log_if_needed(self.root, max_bytes=100)
+        self.chat.write_bytes(b"x" * 200)  # written behind our back: not noticed yet
+        with patch.object(pathlib.Path, "stat", side_effect=AssertionError("stat")):
+            state.rotate_chat_log_if_needed(self.root, max_bytes=100)
+        state.note_chat_log_append(50)
+        state.rotate_chat_log_if_needed(self.root, max_bytes=100)
+        self.assertEqual(self.chat.read_bytes(), b"")
+        self.assertEqual([p.read_bytes() for p in (self.root / "archive").iterdir()], [b"x" * 200])
+        self.assertEqual(state._CHAT_LOG_APPROX_BYTES, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
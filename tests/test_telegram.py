@@ -0,0 +1,161 @@
+"""Tests for supervisor.telegram text helpers."""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _split_reference(text, limit=3800):
+    chunks = []
+    s = text
+    while len(s) > limit:
+        cut = s.rfind("\n", 0, limit)
+        if cut < 100:
+            cut = limit
+        chunks.append(s[:cut])
+        s = s[cut:]
+    chunks.append(s)
+    return chunks
+
+
+class TestSplitTelegram(unittest.TestCase):
+    """Test message splitting at newline boundaries."""
+
+    def test_short_text_single_chunk(self):
+        from supervisor.telegram import split_telegram
+        self.assertEqual(split_telegram("hello"), ["hello"])
+        self.assertEqual(split_telegram(""), [""])
+
+    def test_matches_reference(self):
+        from supervisor.telegram import split_telegram
+        rng = random.Random(7)
+        for _ in range(100):
+            lines = ["x" * rng.randint(0, 400) for _ in range(rng.randint(1, 80))]
+            text = "\n".join(lines)
+            limit = rng.choice([200, 500, 3800])
+            chunks = split_telegram(text, limit)
+            self.assertEqual(chunks, _split_reference(text, limit))
+            self.assertEqual("".join(chunks), text)
+            self.assertTrue(all(len(c) <= limit for c in chunks))
+
+
+class TestTelegramPoller(unittest.TestCase):
+    """Test the background getUpdates poller."""
+
+    def test_queues_updates_and_advances_offset(self):
+        import threading
+        import time
+
+        from supervisor.telegram import TelegramPoller
+
+        calls, errors, done = [], [], threading.Event()
+
+        class FakeTG:
+            def get_updates(self, offset, timeout=10):
+                calls.append(offset)
+                if len(calls) == 1:
+                    return [{"update_id": 5}, {"update_id": 6}]
+                if len(calls) == 2:
+                    raise RuntimeError("boom")
+                done.set()
+                time.sleep(0.01)
+                return []
+
+        wakeups = []
+        poller = TelegramPoller(FakeTG(), offset=5, on_error=lambda e, off: errors.append(off),
+                                error_backoff_sec=0.01, on_updates=lambda: wakeups.append(1))
+        poller.start()
+        try:
+            deadline = time.time() + 2.0
+            while poller.updates.qsize() < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.1)
+            self.assertEqual(calls, [5])  # no re-poll (which would confirm 5, 6) before ack
+            self.assertEqual([u["update_id"] for u in poller.drain()], [5, 6])
+            self.assertEqual(poller.drain(), [])
+            poller.ack(7)
+            self.assertTrue(done.wait(2.0))
+        finally:
+            poller.stop()
+        self.assertEqual(calls[:3], [5, 7, 7])
+        self.assertEqual(errors, [7])
+        self.assertEqual(wakeups, [1])  # only batches that carried updates
+
+
+class TestBudgetLine(unittest.TestCase):
+    """Test that the budget message counter is persisted as it changes."""
+
+    def test_counter_changes_are_deferred_to_state(self):
+        from unittest.mock import patch
+
+        from supervisor import telegram
+        recorded = []
+        with patch.object(telegram, "_budget_msgs_since_report", 0), \
+                patch.object(telegram, "BUDGET_REPORT_EVERY_MESSAGES", 3), \
+                patch.object(telegram, "peek_state", return_value={}), \
+                patch.object(telegram, "update_state_deferred",
+                             side_effect=lambda **kw: recorded.append(kw["budget_messages_since_report"])):
+            lines = [telegram.budget_line() for _ in range(4)]
+        self.assertEqual(recorded, [1, 2, 0, 1])
+        self.assertEqual([bool(x) for x in lines], [False, False, True, False])
+
+
+class TestOutbox(unittest.TestCase):
+    """Test the background send_with_budget outbox."""
+
+    def test_sends_in_order_off_thread(self):
+        import threading
+        from unittest.mock import patch
+
+        from supervisor import telegram
+        sent, done = [], threading.Event()
+
+        def fake_send(chat_id, text, **kwargs):
+            sent.append((chat_id, text, kwargs, threading.current_thread().name))
+            if len(sent) == 3:
+                done.set()
+
+        with patch.object(telegram, "send_with_budget", fake_send):
+            for i in range(3):
+                telegram.send_with_budget_later(1, f"m{i}", fmt="markdown")
+            self.assertTrue(done.wait(2.0))
+            telegram.flush_outbox()
+        self.assertEqual([s[1] for s in sent], ["m0", "m1", "m2"])
+        self.assertTrue(all(s[2] == {"fmt": "markdown"} for s in sent))
+        self.assertTrue(all(s[3] == "tg-outbox" for s in sent))
+
+    def test_flush_waits_for_in_flight_send(self):
+        import threading
+        from unittest.mock import patch
+
+        from supervisor import telegram
+        sent, started, release = [], threading.Event(), threading.Event()
+        active = []
+
+        def fake_send(chat_id, text, **kwargs):
+            active.append(text)
+            self.assertEqual(len(active), 1)  # never two senders at once
+            if text == "m0":
+                started.set()
+                release.wait(2.0)
+            sent.append((text, threading.current_thread().name))
+            active.remove(text)
+
+        with patch.object(telegram, "send_with_budget", fake_send):
+            telegram.send_with_budget_later(1, "m0")
+            self.assertTrue(started.wait(2.0))
+            for i in range(1, 4):
+                telegram.send_with_budget_later(1, f"m{i}")
+            threading.Timer(0.2, release.set).start()
+            telegram.flush_outbox()
+            self.assertFalse(telegram._outbox_thread.is_alive())
+        self.assertEqual([s[0] for s in sent], ["m0", "m1", "m2", "m3"])
+        self.assertEqual(sent[0][1], "tg-outbox")
+        self.assertEqual({s[1] for s in sent[1:]}, {threading.current_thread().name})
+
+
+if __name__ == "__main__":
+    unittest.main()
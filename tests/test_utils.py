@@ -0,0 +1,152 @@
+"""Tests for ouroboros.utils helpers."""
+
+import json
+import os
+import pathlib
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestDeferredJsonl(unittest.TestCase):
+    """Test deferred JSONL appends and explicit flushing."""
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.root = pathlib.Path(self._tmpdir.name)
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def _read(self, path):
+        return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+    def test_flush_preserves_order_across_files(self):
+        from ouroboros.utils import append_jsonl_deferred, flush_jsonl
+        a, b = self.root / "a.jsonl", self.root / "b.jsonl"
+        for i in range(50):
+            append_jsonl_deferred(a if i % 2 else b, {"i": i})
+        flush_jsonl()
+        self.assertEqual([r["i"] for r in self._read(a)], list(range(1, 50, 2)))
+        self.assertEqual([r["i"] for r in self._read(b)], list(range(0, 50, 2)))
+
+    def test_flush_writes_each_file_once(self):
+        from unittest.mock import patch
+
+        import ouroboros.utils as utils
+        a, b = self.root / "a.jsonl", self.root / "b.jsonl"
+        for i in range(20):
+            utils.append_jsonl_deferred(a if i % 4 else b, {"i": i})
+        with patch.object(utils, "_append_jsonl_bytes", wraps=utils._append_jsonl_bytes) as write:
+            utils.flush_jsonl()
+        self.assertLessEqual(write.call_count, 2)  # background flusher may have run first
+        self.assertEqual(len(self._read(a)), 15)
+
+    def test_burst_wakes_flusher_early(self):
+        import time
+        from unittest.mock import patch
+
+        import ouroboros.utils as utils
+        path = self.root / "burst.jsonl"
+        utils.append_jsonl_deferred(path, {"i": -1})  # make sure the flusher is running
+        utils.flush_jsonl()
+        with patch.object(utils, "JSONL_FLUSH_INTERVAL_SEC", 30.0), \
+                patch.object(utils, "JSONL_FLUSH_MAX_PENDING", 10):
+            time.sleep(0.6)  # let the flusher enter its (now long) wait
+            for i in range(10):
+                utils.append_jsonl_deferred(path, {"i": i})
+            deadline = time.time() + 2.0
+            while len(self._read(path)) < 11 and time.time() < deadline:
+                time.sleep(0.02)
+        utils._jsonl_wake.set()  # don't leave the flusher parked on the patched interval
+        self.assertEqual(len(self._read(path)), 11)
+
+    def test_flush_when_empty_is_noop(self):
+        from ouroboros.utils import flush_jsonl
+        flush_jsonl()
+        self.assertEqual(list(self.root.iterdir()), [])
+
+
+class TestAppendJsonl(unittest.TestCase):
+    """Test the cached lock-path bookkeeping of append_jsonl."""
+
+    def test_recreates_removed_directory(self):
+        import shutil
+
+        from ouroboros.utils import append_jsonl
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp) / "logs" / "chat.jsonl"
+            append_jsonl(path, {"i": 0})
+            shutil.rmtree(path.parent)
+            append_jsonl(path, {"i": 1})
+            self.assertEqual([json.loads(x)["i"] for x in path.read_text().splitlines()], [1])
+            self.assertEqual([p.name for p in path.parent.iterdir()], ["chat.jsonl"])  # lock released
+
+
+class TestReadTailLines(unittest.TestCase):
+    """Test backwards tail reads against a full read."""
+
+    def test_matches_full_read(self):
+        from ouroboros.utils import read_tail_lines
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp) / "log.jsonl"
+            lines = [json.dumps({"i": i, "text": "é" * (i % 37)}) for i in range(500)]
+            path.write_text("\n".join(lines[:250]) + "\n\n" + "\n".join(lines[250:]) + "\n", encoding="utf-8")
+            for n in (1, 10, 100, 499, 500, 1000):
+                self.assertEqual(read_tail_lines(path, n, chunk_size=64), lines[-n:])
+            path.write_text("", encoding="utf-8")
+            self.assertEqual(read_tail_lines(path, 5), [])
+
+
+class TestUtcNowIso(unittest.TestCase):
+    """Test the fast ISO timestamp formatter against datetime.isoformat()."""
+
+    def test_matches_datetime_isoformat(self):
+        import datetime
+        from unittest.mock import patch
+
+        import ouroboros.utils as utils
+        for ns in (1_700_000_000_000_000_000, 1_700_000_000_123_456_789, 1_700_000_001_000_001_000):
+            expected = datetime.datetime.fromtimestamp(ns // 1000 / 1e6, tz=datetime.timezone.utc)
+            expected = expected.replace(microsecond=(ns // 1000) % 1_000_000).isoformat()
+            with patch.object(utils.time, "time_ns", return_value=ns):
+                self.assertEqual(utils.utc_now_iso(), expected)
+
+
+class TestJsonHelpers(unittest.TestCase):
+    """Test json_dumps/json_loads with and without orjson."""
+
+    def test_roundtrip_both_backends(self):
+        from unittest.mock import patch
+
+        import ouroboros.utils as utils
+        obj = {"text": "привет ✓", "n": 1, "nested": {"x": [1.5, None, True]}}
+        for backend in (utils._orjson, None):
+            with patch.object(utils, "_orjson", backend):
+                self.assertEqual(utils.json_loads(utils.json_dumps(obj)), obj)
+                self.assertEqual(utils.json_loads(utils.json_dumps_bytes(obj)), obj)
+                self.assertIn("привет", utils.json_dumps(obj))
+                self.assertIn('\n  "text"', utils.json_dumps(obj, indent=True))
+
+
+class TestHttpSession(unittest.TestCase):
+    """Test the shared retrying HTTP session."""
+
+    def test_adapter_retries_rate_limits(self):
+        from ouroboros.utils import make_http_session
+        session = make_http_session()
+        retry = session.get_adapter("https://api.telegram.org").max_retries
+        self.assertEqual(retry.total, 3)
+        self.assertIn(429, retry.status_forcelist)
+        self.assertTrue(retry.respect_retry_after_header)
+        self.assertFalse(retry.raise_on_status)
+
+    def test_shared_session_is_reused(self):
+        from ouroboros.utils import http_session
+        self.assertIs(http_session(), http_session())
+
+
+if __name__ == "__main__":
+    unittest.main()
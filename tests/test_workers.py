@@ -0,0 +1,83 @@
+"""Tests for supervisor.workers process management helpers."""
+
+import multiprocessing as mp
+import os
+import signal
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _ignore_sigterm_and_sleep():
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    time.sleep(60)
+
+
+class TestTerminateProcesses(unittest.TestCase):
+    """Test shared-deadline termination with SIGKILL escalation."""
+
+    def test_stubborn_workers_share_one_deadline(self):
+        from supervisor.workers import terminate_processes
+        ctx = mp.get_context("fork")
+        procs = [ctx.Process(target=_ignore_sigterm_and_sleep, daemon=True) for _ in range(3)]
+        for p in procs:
+            p.start()
+        time.sleep(0.2)  # let the children install their SIGTERM handler
+        started = time.time()
+        terminate_processes(procs, grace_sec=0.5)
+        self.assertLess(time.time() - started, 3.0)
+        self.assertFalse(any(p.is_alive() for p in procs))
+        self.assertEqual([p.exitcode for p in procs], [-signal.SIGKILL] * 3)
+
+
+class TestTerminateLater(unittest.TestCase):
+    """Test non-blocking termination with asynchronous reaping."""
+
+    def test_reaped_without_blocking(self):
+        from supervisor import workers
+        ctx = mp.get_context("fork")
+        stubborn = ctx.Process(target=_ignore_sigterm_and_sleep, daemon=True)
+        polite = ctx.Process(target=time.sleep, args=(60,), daemon=True)
+        stubborn.start()
+        polite.start()
+        time.sleep(0.2)
+        started = time.time()
+        workers.terminate_later(stubborn, grace_sec=0.3)
+        workers.terminate_later(polite, grace_sec=0.3)
+        self.assertLess(time.time() - started, 0.2)
+        deadline = time.time() + 5.0
+        while workers._REAPING and time.time() < deadline:
+            workers.reap_terminated()
+            time.sleep(0.05)
+        self.assertEqual(workers._REAPING, [])
+        self.assertEqual(polite.exitcode, -signal.SIGTERM)
+        self.assertEqual(stubborn.exitcode, -signal.SIGKILL)
+
+
+class TestMainLoopHeartbeat(unittest.TestCase):
+    """Test the diagnostic heartbeat on a tick that handled no updates."""
+
+    def test_first_tick_without_updates(self):
+        import json
+        import pathlib
+        import tempfile
+        from unittest.mock import patch
+
+        from ouroboros.utils import flush_jsonl
+        from supervisor import workers
+        with tempfile.TemporaryDirectory() as tmp:
+            root = pathlib.Path(tmp)
+            with patch.object(workers, "DRIVE_ROOT", root), \
+                    patch.object(workers, "peek_state", return_value={"spent_usd": 1.25}):
+                workers.log_main_loop_heartbeat(offset=0)
+                flush_jsonl()
+            rec = json.loads((root / "logs" / "supervisor.jsonl").read_text().splitlines()[-1])
+        self.assertEqual(rec["type"], "main_loop_heartbeat")
+        self.assertEqual((rec["offset"], rec["spent_usd"]), (0, 1.25))
+        self.assertEqual(rec["running_task_ids"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()